@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Hotel Management - Room Allocator
+Per-category room ranges with a next-free cursor and a heap of released rooms
+"""
+
+import heapq
+from bisect import bisect_right
+
+
+def as_ranges(rooms):
+    """Inclusive (start, end) ranges for RoomRanges, range objects or room lists."""
+    if hasattr(rooms, "ranges"):
+        return list(rooms.ranges)
+    if isinstance(rooms, range) and rooms.step == 1:
+        return [(rooms.start, rooms.stop - 1)] if rooms else []
+    ranges = []
+    for room in sorted(rooms):
+        if ranges and room == ranges[-1][1] + 1:
+            ranges[-1] = (ranges[-1][0], room)
+        else:
+            ranges.append((room, room))
+    return ranges
+
+
+# -----------------------------
+# Room Allocator
+# -----------------------------
+class _Category:
+    """Rooms below `cursor` are occupied unless they sit in `released`."""
+
+    def __init__(self, ranges):
+        self.ranges = ranges
+        self.size = sum(end - start + 1 for start, end in ranges)
+        self.span = 0
+        self.cursor = ranges[0][0] if ranges else None
+        self.released = []
+        self.used = 0
+
+    def advance(self):
+        """Move the cursor to the next room number, crossing range gaps."""
+        if self.cursor < self.ranges[self.span][1]:
+            self.cursor += 1
+        elif self.span + 1 < len(self.ranges):
+            self.span += 1
+            self.cursor = self.ranges[self.span][0]
+        else:
+            self.cursor = None
+
+
+class RoomAllocator:
+    """Hands out the lowest free room of a category in O(log n) without
+    expanding the categories' room ranges."""
+
+    def __init__(self, room_types, occupied=()):
+        self.categories = {}
+        spans = []
+        for category, info in room_types.items():
+            ranges = as_ranges(info["rooms"])
+            self.categories[category] = _Category(ranges)
+            spans += [(start, end, category) for start, end in ranges]
+        spans.sort()
+        self.spans = spans
+        self.span_starts = [start for start, _, _ in spans]
+        self.occupied = set()
+
+        for room in occupied:
+            self.take(room)
+
+    def category_of(self, room):
+        """Category of a room number, or None if it belongs to none."""
+        i = bisect_right(self.span_starts, room) - 1
+        if i >= 0 and room <= self.spans[i][1]:
+            return self.spans[i][2]
+        return None
+
+    def allocate(self, category):
+        """Reserve and return the lowest free room, or None if full."""
+        cat = self.categories.get(category)
+        if cat is None:
+            return None
+        while cat.released:
+            room = heapq.heappop(cat.released)
+            # Rooms re-taken after release are dropped lazily here
+            if room not in self.occupied:
+                return self._occupy(cat, room)
+        while cat.cursor is not None:
+            room = cat.cursor
+            cat.advance()
+            if room not in self.occupied:
+                return self._occupy(cat, room)
+        return None
+
+    def _occupy(self, cat, room):
+        self.occupied.add(room)
+        cat.used += 1
+        return room
+
+    def take(self, room):
+        """Mark a specific room as occupied."""
+        category = self.category_of(room)
+        if category is not None and room not in self.occupied:
+            self._occupy(self.categories[category], room)
+
+    def release(self, room):
+        """Return a room to its category's free pool."""
+        category = self.category_of(room)
+        if category is None or room not in self.occupied:
+            return
+        cat = self.categories[category]
+        self.occupied.discard(room)
+        cat.used -= 1
+        if cat.cursor is None or room < cat.cursor:
+            heapq.heappush(cat.released, room)
+
+    def vacancy(self, category):
+        """Number of free rooms in a category."""
+        cat = self.categories.get(category)
+        return cat.size - cat.used if cat else 0
+
+    def vacancies(self):
+        """Free-room counts for every category."""
+        return {category: cat.size - cat.used for category, cat in self.categories.items()}
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Hotel Management - Occupancy & Revenue Analytics
+Bookings as columnar NumPy arrays with vectorized aggregates
+
+Usage:
+    python analytics.py [--json] [--history [--from YYYY-MM-DD] [--to YYYY-MM-DD]]
+"""
+
+import json
+import sys
+from tkinter import *
+
+import history
+import metrics
+from booking import CARD, CASH
+from inventory import INVENTORY
+from pricing import PRICING
+from storage import open_store, room_of
+from worker import BackgroundWorker
+
+try:
+    import numpy as np
+except ImportError:  # analytics is optional; the rest of the app runs without NumPy
+    np = None
+
+NO_DATE = -1
+
+
+# -----------------------------
+# Columns
+# -----------------------------
+def _lookup(starts, ends, values, rooms, default):
+    """Vectorized range lookup: values[i] for the range [starts[i], ends[i]]
+    holding each room, or default."""
+    if not len(starts):
+        return np.full(len(rooms), default, dtype=np.asarray(values).dtype)
+    i = np.searchsorted(starts, rooms, side="right") - 1
+    inside = (i >= 0) & (rooms <= np.asarray(ends)[np.maximum(i, 0)])
+    return np.where(inside, np.asarray(values)[np.maximum(i, 0)], default)
+
+
+def load_columns(records):
+    """Columnar arrays for an iterable of booking records.
+
+    room_no, category (0 = not in the inventory), days (0 = unknown),
+    price, payment (0 = not recorded), discount (what the card discount
+    took off card stays), arrival and departure (date ordinals, NO_DATE
+    when missing).
+    """
+    if np is None:
+        raise RuntimeError("Analytics needs NumPy: pip install numpy")
+
+    rooms, days, prices, payments, arrivals, departures = [], [], [], [], [], []
+    for record in records:
+        arrival = getattr(record, "arrival", None)
+        departure = getattr(record, "departure", None)
+        rooms.append(room_of(record) or 0)
+        days.append(int(getattr(record, "days", 0) or 0))
+        prices.append(float(record.price or 0))
+        payments.append(getattr(record, "payment", None) or 0)
+        arrivals.append(arrival.toordinal() if arrival else NO_DATE)
+        departures.append(departure.toordinal() if departure else NO_DATE)
+
+    cols = {
+        "room_no": np.array(rooms, dtype=np.int64),
+        "days": np.array(days, dtype=np.int32),
+        "price": np.array(prices, dtype=np.float64),
+        "payment": np.array(payments, dtype=np.int8),
+        "arrival": np.array(arrivals, dtype=np.int64),
+        "departure": np.array(departures, dtype=np.int64),
+    }
+    dated = cols["arrival"] != NO_DATE
+    cols["days"] = np.where(dated, cols["departure"] - cols["arrival"], cols["days"]).astype(np.int32)
+
+    spans = INVENTORY.spans
+    cols["category"] = _lookup([s[0] for s in spans], [s[1] for s in spans],
+                               np.array([s[2] for s in spans], dtype=np.int32),
+                               cols["room_no"], 0).astype(np.int32)
+    card_share = PRICING.card_discount
+    cols["discount"] = np.where(cols["payment"] == CARD,
+                                cols["price"] * card_share / (1 - card_share), 0.0)
+    return cols
+
+
+# -----------------------------
+# Aggregates
+# -----------------------------
+def summarize(cols, total_rooms=None, current=True):
+    """Occupancy, revenue and stay statistics as a plain dict.
+
+    `current` marks cols as the checked-in guests, which adds the
+    occupied-now figure.
+    """
+    if np is None:
+        raise RuntimeError("Analytics needs NumPy: pip install numpy")
+    total_rooms = total_rooms or sum(len(c["rooms"]) for c in INVENTORY.categories.values())
+    count = len(cols["room_no"])
+    category, price, days = cols["category"], cols["price"], cols["days"]
+    size = max(INVENTORY.categories, default=0) + 1
+
+    revenue = np.bincount(category, weights=price, minlength=size)
+    stays = np.bincount(category, minlength=size)
+    known = days > 0
+    nights = np.bincount(category[known], weights=days[known], minlength=size)
+    known_stays = np.bincount(category[known], minlength=size)
+    cash = int(np.count_nonzero(cols["payment"] == CASH))
+    card = int(np.count_nonzero(cols["payment"] == CARD))
+
+    summary = {
+        "stays": count,
+        "rooms": total_rooms,
+        "revenue_total": float(price.sum()),
+        "average_stay_days": float(days[known].mean()) if known.any() else 0.0,
+        "payment_mix": {"cash": cash, "card": card, "unknown": count - cash - card},
+        "card_discount_total": float(cols["discount"].sum()),
+        "categories": {},
+    }
+    if current:
+        summary["occupancy_now"] = len(np.unique(cols["room_no"])) / total_rooms if total_rooms else 0.0
+    for cat, info in sorted(INVENTORY.categories.items()):
+        summary["categories"][info["name"]] = {
+            "stays": int(stays[cat]),
+            "revenue": float(revenue[cat]),
+            "average_stay_days": float(nights[cat] / known_stays[cat]) if known_stays[cat] else 0.0,
+        }
+
+    # Daily occupancy over the dated stays: +1 on arrival, -1 on departure
+    dated = cols["arrival"] != NO_DATE
+    if dated.any():
+        first = int(cols["arrival"][dated].min())
+        last = int(cols["departure"][dated].max())
+        change = np.zeros(last - first + 1, dtype=np.int64)
+        np.add.at(change, cols["arrival"][dated] - first, 1)
+        np.add.at(change, cols["departure"][dated] - first, -1)
+        occupied = np.cumsum(change)[:-1]
+        summary["occupancy_rate"] = float(occupied.mean() / total_rooms) if total_rooms else 0.0
+        summary["occupancy_days"] = len(occupied)
+    return summary
+
+
+def format_report(summary):
+    """Human-readable report lines for the CLI and the GUI window."""
+    lines = [
+        f"Stays: {summary['stays']}    Rooms: {summary['rooms']}",
+    ]
+    if "occupancy_now" in summary:
+        lines.append(f"Occupied now: {summary['occupancy_now']:.1%}")
+    if "occupancy_rate" in summary:
+        lines.append(f"Average daily occupancy: {summary['occupancy_rate']:.1%} "
+                     f"over {summary['occupancy_days']} days")
+    lines += [
+        f"Revenue: ₹{summary['revenue_total']:,.2f}",
+        f"Average length of stay: {summary['average_stay_days']:.2f} days",
+        f"Payment mix: cash {summary['payment_mix']['cash']}, card {summary['payment_mix']['card']}"
+        + (f", not recorded {summary['payment_mix']['unknown']}"
+           if summary["payment_mix"]["unknown"] else ""),
+        f"Card discounts given: ₹{summary['card_discount_total']:,.2f}",
+        "",
+        f"{'Category':<15} {'Stays':>8} {'Revenue':>14} {'Avg stay':>9}",
+        "-" * 49,
+    ]
+    for name, cat in summary["categories"].items():
+        lines.append(f"{name:<15} {cat['stays']:>8} {cat['revenue']:>14,.2f} "
+                     f"{cat['average_stay_days']:>9.2f}")
+    return "\n".join(lines)
+
+
+@metrics.timed("analytics")
+def analyze(store):
+    return summarize(load_columns(store.scan()))
+
+
+@metrics.timed("analytics.history")
+def analyze_history(start=None, end=None):
+    """Report over archived stays, reading only the months in range."""
+    return summarize(load_columns(history.scan_history(start, end)), current=False)
+
+
+# -----------------------------
+# GUI Window
+# -----------------------------
+class AnalyticsApp:
+    """Read-only report window; the numbers are computed on the worker thread."""
+
+    def __init__(self, master=None, store=None):
+        self.store = store if store is not None else open_store()
+
+        self.root = Tk() if master is None else Toplevel(master)
+        self.root.geometry("700x450")
+        self.root.title("Hotel Management - Analytics")
+        self.root.configure(background="white")
+        self.worker = BackgroundWorker(self.root)
+
+        Label(self.root, text="ANALYTICS", font=("Segoe UI", 24, "bold"), bg="white").pack(pady=10)
+        self.console = Text(self.root, background="white", foreground="black",
+                            font=("Consolas", 11), wrap=NONE)
+        self.console.pack(fill=BOTH, expand=True, padx=20, pady=10)
+        self.console.insert(INSERT, "Computing...\n")
+
+        self.worker.submit(analyze, self.store, on_done=self.show_report,
+                           on_error=self.show_error)
+        if master is None:
+            self.root.mainloop()
+
+    def show_report(self, summary):
+        self.console.delete("1.0", END)
+        self.console.insert(INSERT, format_report(summary))
+
+    def show_error(self, error):
+        self.console.delete("1.0", END)
+        self.console.insert(INSERT, f"{error}\n")
+
+
+# -----------------------------
+# Run Program
+# -----------------------------
+def main(argv):
+    try:
+        if "--history" in argv:
+            summary = analyze_history(*history.parse_range(argv))
+        else:
+            summary = analyze(open_store())
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        return 1
+    print(json.dumps(summary, indent=2) if "--json" in argv else format_report(summary))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
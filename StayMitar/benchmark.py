@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Hotel Management - Benchmark Suite
+Synthetic booking files and timings across data sizes
+
+Usage:
+    python benchmark.py [--sizes 1000,10000,100000] [--formats pickle,fixed,sqlite]
+                        [--out bench_results.json] [--data-dir bench_data]
+    python benchmark.py generate COUNT PATH [--format pickle|fixed|sqlite]
+    python benchmark.py memory [--count 100000]
+"""
+
+import argparse
+import json
+import os
+import pickle
+import platform
+import random
+import shutil
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+from allocator import RoomAllocator
+from fixedstore import FixedRecordStore
+from booking import Booking
+from main import ROOM_TYPES, calculate_price
+from sqlstore import SQLiteStore
+from storage import BookingStore, Record, room_of
+
+FILE_NAMES = {"pickle": "hotel_{n}.dat", "fixed": "hotel_{n}.rec", "sqlite": "hotel_{n}.db"}
+
+FIRST_NAMES = ["Aarav", "Vivaan", "Aditya", "Ananya", "Diya", "Ishaan", "Kavya", "Meera",
+               "Rohan", "Saanvi", "Arjun", "Priya", "Rahul", "Neha", "Vikram", "Pooja"]
+LAST_NAMES = ["Sharma", "Verma", "Gupta", "Patel", "Singh", "Reddy", "Nair", "Iyer",
+              "Das", "Joshi", "Mehta", "Rao"]
+CITIES = ["Bhilai", "Raipur", "Delhi", "Mumbai", "Pune", "Kolkata", "Chennai", "Nagpur"]
+
+PAGE_SIZE = 20
+LOOKUPS = 1000
+OPS = 100
+REWRITE_OPS = 3
+
+
+# -----------------------------
+# Synthetic Data
+# -----------------------------
+def room_types_for(count):
+    """Scale the four ROOM_TYPES categories up to `count` rooms (plus spare)."""
+    total = int(count * 1.1) + 10
+    shares = [0.2, 0.3, 0.4, 0.1]
+    types, start = {}, 1
+    for (k, v), share in zip(ROOM_TYPES.items(), shares):
+        end = start + max(int(total * share), 1)
+        types[k] = {"name": v["name"], "rate": v["rate"], "rooms": range(start, end)}
+        start = end
+    return types
+
+
+def synthetic_guests(count, seed=42):
+    """Yield `count` plausible guests, each in its own room."""
+    rng = random.Random(seed)
+    types = room_types_for(count)
+    rooms = [(room, k) for k, info in types.items() for room in info["rooms"]]
+    rng.shuffle(rooms)
+    for room, choice in rooms[:count]:
+        days = rng.randint(1, 14)
+        name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+        address = f"{rng.randint(1, 999)}, {rng.choice(CITIES)}"
+        mobile_no = str(rng.randint(6_000_000_000, 9_999_999_999))
+        payment = rng.choice((1, 2))
+        yield Booking(name, address, mobile_no, room, calculate_price(choice, days, payment),
+                      days, payment=payment)
+
+
+def generate(path, count, fmt="pickle"):
+    """Write a synthetic booking file of `count` guests in the given format."""
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    guests = synthetic_guests(count)
+    if fmt == "pickle":
+        with open(path, "wb") as f:
+            for guest in guests:
+                pickle.dump(guest, f, protocol=2)
+    elif fmt == "fixed":
+        store = FixedRecordStore(path)
+        store.insert_many(guests)
+        store.close()
+    elif fmt == "sqlite":
+        store = SQLiteStore(path)
+        store.insert_many(guests)
+        store.close()
+    else:
+        raise ValueError(f"Unknown format: {fmt!r}")
+
+
+def open_path(fmt, path):
+    if fmt == "pickle":
+        return BookingStore(path)
+    if fmt == "fixed":
+        return FixedRecordStore(path)
+    return SQLiteStore(path)
+
+
+# -----------------------------
+# Timings
+# -----------------------------
+def timed(fn, repeat=1):
+    """Mean seconds per call of fn() over `repeat` calls."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def run_case(fmt, count, data_dir):
+    """Time every operation on a fresh copy of one synthetic file."""
+    source = os.path.join(data_dir, FILE_NAMES[fmt].format(n=count))
+    if not os.path.exists(source):
+        generate(source, count, fmt)
+    work = source + ".work"
+    shutil.copyfile(source, work)
+
+    rng = random.Random(7)
+    result = {"format": fmt, "records": count, "file_bytes": os.path.getsize(source)}
+
+    start = time.perf_counter()
+    store = open_path(fmt, work)
+    result["load_s"] = time.perf_counter() - start
+
+    types = room_types_for(count)
+    occupied = list(store.rooms())
+    start = time.perf_counter()
+    allocator = RoomAllocator(types, occupied)
+    result["allocator_build_s"] = time.perf_counter() - start
+    result["allocate_s"] = timed(lambda: allocator.allocate(rng.choice(list(types))), OPS)
+
+    result["get_info_s"] = timed(lambda: store.get(rng.choice(occupied)), LOOKUPS)
+
+    victims = iter(rng.sample(occupied, OPS + REWRITE_OPS))
+    result["checkout_s"] = timed(lambda: store.delete(next(victims)), OPS)
+    if fmt == "pickle":
+        store.journal = False
+        result["checkout_rewrite_s"] = timed(lambda: store.delete(next(victims)), REWRITE_OPS)
+
+    result["list_page_s"] = timed(lambda: store.page(0, PAGE_SIZE, "name"))
+    result["list_page_cached_s"] = timed(lambda: store.page(count // 2, PAGE_SIZE, "name"), 10)
+    result["list_full_s"] = timed(
+        lambda: [f"{g.name:<20} {room_of(g):<10}" for g in store.scan()])
+
+    if hasattr(store, "close"):
+        store.close()
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(work + suffix):
+            os.remove(work + suffix)
+    return result
+
+
+def run(sizes, formats, data_dir, out):
+    os.makedirs(data_dir, exist_ok=True)
+    report = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": [],
+    }
+    for count in sizes:
+        for fmt in formats:
+            result = run_case(fmt, count, data_dir)
+            report["results"].append(result)
+            print(f"{fmt:<7} {count:>9,}  load {result['load_s'] * 1000:9.1f} ms  "
+                  f"get {result['get_info_s'] * 1e6:8.1f} µs  "
+                  f"checkout {result['checkout_s'] * 1000:7.2f} ms")
+
+    with open(out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {out}")
+
+
+# -----------------------------
+# Memory Footprint
+# -----------------------------
+class DictBooking:
+    """The pre-`booking.Booking` layout: a plain class with a __dict__."""
+
+    def __init__(self, name, address, mobile_no, room_no, price, days):
+        self.name = name
+        self.address = address
+        self.mobile_no = mobile_no
+        self.room_no = room_no
+        self.price = price
+        self.days = days
+
+
+def _as_record(name, address, mobile_no, room_no, price, days):
+    record = Record()
+    record.name, record.address, record.mobile_no = name, address, mobile_no
+    record.room_no, record.price, record.days = room_no, price, days
+    return record
+
+
+def traced(build):
+    """Bytes still allocated by build() once it returns (its result kept alive)."""
+    tracemalloc.start()
+    try:
+        result = build()
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del result
+    return size
+
+
+def memory_report(count):
+    """Bytes per `count` records for each booking layout.
+
+    Field values are built first and shared, so only the per-record
+    containers are measured.
+    """
+    rows = [(g.name, g.address, g.mobile_no, g.room_no, g.price, g.days)
+            for g in synthetic_guests(count)]
+    report = {
+        "dict class (old Guest / Booking)": traced(lambda: [DictBooking(*row) for row in rows]),
+        "storage.Record (unpickled fallback)": traced(lambda: [_as_record(*row) for row in rows]),
+        "booking.Booking (__slots__)": traced(lambda: [Booking(*row) for row in rows]),
+    }
+    import analytics
+    if analytics.np is not None:
+        bookings = [Booking(*row) for row in rows]
+        report["analytics columns (no text fields)"] = traced(
+            lambda: analytics.load_columns(bookings))
+    return report
+
+
+# -----------------------------
+# Run Program
+# -----------------------------
+def main(argv):
+    if argv[:1] == ["generate"]:
+        parser = argparse.ArgumentParser(prog="benchmark.py generate")
+        parser.add_argument("count", type=int)
+        parser.add_argument("path")
+        parser.add_argument("--format", default="pickle", choices=FILE_NAMES)
+        args = parser.parse_args(argv[1:])
+        generate(args.path, args.count, args.format)
+        return 0
+
+    if argv[:1] == ["memory"]:
+        parser = argparse.ArgumentParser(prog="benchmark.py memory")
+        parser.add_argument("--count", type=int, default=100_000)
+        args = parser.parse_args(argv[1:])
+        print(f"Memory per {args.count:,} records:")
+        for layout, size in memory_report(args.count).items():
+            print(f"   {layout:<38} {size / 2**20:8.2f} MiB")
+        return 0
+
+    parser = argparse.ArgumentParser(prog="benchmark.py")
+    parser.add_argument("--sizes", default="1000,10000,100000",
+                        help="comma-separated record counts, e.g. 1000,1000000")
+    parser.add_argument("--formats", default="pickle,fixed,sqlite")
+    parser.add_argument("--data-dir", default="bench_data")
+    parser.add_argument("--out", default="bench_results.json")
+    args = parser.parse_args(argv)
+    run([int(n) for n in args.sizes.split(",")], args.formats.split(","),
+        args.data_dir, args.out)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
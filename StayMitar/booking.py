@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Hotel Management - Booking Record
+The one booking type shared by the front ends and the stores
+"""
+
+FIELDS = ("name", "address", "mobile_no", "room_no", "price", "days",
+          "arrival", "departure", "checked_out", "payment")
+
+# payment values; None on records saved before it was recorded
+CASH = 1
+CARD = 2
+
+# Field names the old GUI (mobile) and console (room) records used
+OLD_NAMES = {"mobile_no": "mobile", "room_no": "room"}
+
+
+class Booking:
+    """A guest's stay.
+
+    __slots__ keeps instances free of a per-object __dict__, and living
+    in its own module gives pickles a stable class path (booking.Booking)
+    whichever script wrote them.
+    """
+
+    __slots__ = FIELDS
+
+    def __init__(self, name, address, mobile_no, room_no, price=0, days=0,
+                 arrival=None, departure=None, checked_out=None, payment=None):
+        self.name = name
+        self.address = address
+        self.mobile_no = mobile_no
+        self.room_no = room_no
+        self.price = price
+        self.days = days
+        self.arrival = arrival
+        self.departure = departure
+        self.checked_out = checked_out
+        self.payment = payment
+
+    def __setstate__(self, state):
+        # A (None, slots) pair, or the __dict__ of a booking pickled before
+        # this class had slots; missing fields (e.g. payment) default to None
+        if isinstance(state, tuple):
+            state = state[1]
+        for field in FIELDS:
+            setattr(self, field, state.get(field, state.get(OLD_NAMES.get(field))))
+
+    # Older spellings: the console used `room`, the GUI `mobile`
+    @property
+    def room(self):
+        return self.room_no
+
+    @property
+    def mobile(self):
+        return self.mobile_no
+
+    def __repr__(self):
+        return f"Booking(room {self.room_no}, {self.name!r})"
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Hotel Management - Group Check-in / Check-out
+Batch bookings from a CSV or JSON-lines file in a single write
+
+Usage:
+    python bulk.py checkin guests.csv|guests.jsonl
+    python bulk.py checkout 12 13 14 ...
+    python bulk.py checkout --file rooms.txt
+"""
+
+import csv
+import json
+import sys
+
+from main import HotelSystem
+from storage import room_of
+
+
+# -----------------------------
+# File Readers
+# -----------------------------
+def read_guests(path):
+    """Read guest rows from CSV (with a header) or JSON lines."""
+    if path.endswith((".jsonl", ".json")):
+        with open(path, encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+def read_rooms(args):
+    """Room numbers from the command line, or one per line with --file."""
+    if args[:1] == ["--file"]:
+        with open(args[1]) as f:
+            args = f.read().split()
+    return [int(arg) for arg in args]
+
+
+# -----------------------------
+# Run Program
+# -----------------------------
+def main(argv):
+    if len(argv) < 2 or argv[0] not in ("checkin", "checkout"):
+        print(__doc__.split("Usage:")[1])
+        return 1
+
+    system = HotelSystem()
+    if argv[0] == "checkin":
+        try:
+            guests = system.check_in_batch(read_guests(argv[1]))
+        except ValueError as e:
+            print(f"❌ Group check-in cancelled, nothing was saved: {e}")
+            return 1
+        print(f"✅ Checked in {len(guests)} guests.")
+        for g in guests:
+            print(f"   Room {g.room_no:<6} {g.name:<20} ₹{g.price}")
+        return 0
+
+    guests, missing = system.check_out_batch(read_rooms(argv[1:]))
+    print(f"✅ Checked out {len(guests)} guests.")
+    for g in guests:
+        print(f"   Room {room_of(g):<6} {g.name}")
+    if missing:
+        print(f"❌ No guest found in rooms: {', '.join(map(str, missing))}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -1,137 +1,139 @@
-#!/usr/bin/env python3
-# -*- coding: utf-8 -*-
-"""
-Hotel Management - Checkout System (Tkinter GUI)
-Refactored & Clean Version
-"""
-
-import os
-import sys
-import pickle
-from tkinter import *
-import tkinter.ttk as ttk
-
-
-# -----------------------------
-# Data Model
-# -----------------------------
-class Booking:
-    """Represents a hotel booking record."""
-
-    def __init__(self, name, address, mobile_no, room_no, price):
-        self.name = name
-        self.address = address
-        self.mobile_no = mobile_no
-        self.room_no = room_no
-        self.price = price
-
-
-# -----------------------------
-# Utility Functions
-# -----------------------------
-def restart_program():
-    """Restart the current Python program."""
-    python = sys.executable
-    os.execl(python, python, *sys.argv)
-
-
-# -----------------------------
-# Main Checkout Application
-# -----------------------------
-class CheckoutApp:
-    """Main application class for Hotel Checkout."""
-
-    def __init__(self):
-        # Tkinter setup
-        self.root = Tk()
-        self.root.geometry("1011x750")
-        self.root.title("Hotel Management - Checkout")
-        self.root.configure(background="white")
-
-        self.data = StringVar()
-        self.setup_ui()
-
-        self.root.mainloop()
-
-    # -----------------------------
-    # GUI Setup
-    # -----------------------------
-    def setup_ui(self):
-        """Setup all checkout window UI components."""
-        frame = Frame(self.root, bg="white", borderwidth=2, relief=GROOVE)
-        frame.place(relx=0.04, rely=0.04, relheight=0.91, relwidth=0.91)
-
-        # Label
-        Label(frame,
-              text="Enter Room No.:",
-              font=("Segoe UI", 23, "bold"),
-              bg="white").place(relx=0.14, rely=0.12, height=46, width=442)
-
-        # Entry for room number
-        Entry(frame,
-              textvariable=self.data,
-              font=("Courier New", 12),
-              bg="white").place(relx=0.67, rely=0.12, height=44, relwidth=0.07)
-
-        # Checkout Button
-        Button(frame,
-               text="CHECK OUT",
-               font=("Segoe UI", 24, "bold"),
-               bg="white",
-               command=self.check_room).place(relx=0.34, rely=0.28, height=93, width=286)
-
-        # Output text area
-        self.console = Text(frame,
-                            background="white",
-                            foreground="black",
-                            wrap=WORD,
-                            font=("Segoe UI", 10))
-        self.console.place(relx=0.05, rely=0.54, relheight=0.4, relwidth=0.89)
-
-    # -----------------------------
-    # Business Logic
-    # -----------------------------
-    def check_room(self):
-        """Validate and process checkout for entered room number."""
-        room_str = self.data.get().strip()
-
-        if not room_str.isdigit():
-            self.console.insert(INSERT, "Invalid input! Please enter a valid room number.\n")
-            return
-
-        room_no = int(room_str)
-        guest_found = False
-        guest_name = ""
-
-        try:
-            with open("hotel.dat", "rb") as infile, open("temp.dat", "ab") as outfile:
-                while True:
-                    try:
-                        record = pickle.load(infile)
-                        if record.room_no == room_no:
-                            guest_found = True
-                            guest_name = record.name
-                            # Do not copy this record → removing guest
-                        else:
-                            pickle.dump(record, outfile)
-                    except EOFError:
-                        break
-        except FileNotFoundError:
-            self.console.insert(INSERT, "No booking records found.\n")
-            return
-
-        # Replace old file with updated one
-        os.remove("hotel.dat")
-        os.rename("temp.dat", "hotel.dat")
-
-        if guest_found:
-            self.console.insert(INSERT, f"Thank you {guest_name.upper()} for visiting us!\n")
-        else:
-            self.console.insert(INSERT, "No guest found with this room number.\n")
-
-
-# -----------------------------
-# Run Program
-# -----------------------------
-if __name__ == "__main__":
-    CheckoutApp()
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Hotel Management - Checkout System (Tkinter GUI)
+Refactored & Clean Version
+"""
+
+import os
+import sys
+from tkinter import *
+import tkinter.ttk as ttk
+
+import history
+import metrics
+from storage import open_store
+from worker import BackgroundWorker
+
+
+# -----------------------------
+# Utility Functions
+# -----------------------------
+def restart_program():
+    """Restart the current Python program."""
+    python = sys.executable
+    os.execl(python, python, *sys.argv)
+
+
+# -----------------------------
+# Main Checkout Application
+# -----------------------------
+class CheckoutApp:
+    """Main application class for Hotel Checkout."""
+
+    def __init__(self, master=None, store=None, rooms=None, search=None, book=None):
+        self.store = store if store is not None else open_store()
+        self.rooms = rooms
+        self.search = search
+        self.book = book
+
+        # Tkinter setup
+        self.root = Tk() if master is None else Toplevel(master)
+        self.root.geometry("1011x750")
+        self.root.title("Hotel Management - Checkout")
+        self.root.configure(background="white")
+
+        self.data = StringVar()
+        self.worker = BackgroundWorker(self.root)
+        self.setup_ui()
+
+        if master is None:
+            self.root.mainloop()
+
+    # -----------------------------
+    # GUI Setup
+    # -----------------------------
+    def setup_ui(self):
+        """Setup all checkout window UI components."""
+        frame = Frame(self.root, bg="white", borderwidth=2, relief=GROOVE)
+        frame.place(relx=0.04, rely=0.04, relheight=0.91, relwidth=0.91)
+
+        # Label
+        Label(frame,
+              text="Enter Room No.:",
+              font=("Segoe UI", 23, "bold"),
+              bg="white").place(relx=0.14, rely=0.12, height=46, width=442)
+
+        # Entry for room number
+        Entry(frame,
+              textvariable=self.data,
+              font=("Courier New", 12),
+              bg="white").place(relx=0.67, rely=0.12, height=44, relwidth=0.07)
+
+        # Checkout Button
+        Button(frame,
+               text="CHECK OUT",
+               font=("Segoe UI", 24, "bold"),
+               bg="white",
+               command=self.check_room).place(relx=0.34, rely=0.28, height=93, width=286)
+
+        # Output text area
+        self.console = Text(frame,
+                            background="white",
+                            foreground="black",
+                            wrap=WORD,
+                            font=("Segoe UI", 10))
+        self.console.place(relx=0.05, rely=0.54, relheight=0.4, relwidth=0.89)
+
+    # -----------------------------
+    # Business Logic
+    # -----------------------------
+    def check_room(self):
+        """Validate and process checkout for entered room number."""
+        room_str = self.data.get().strip()
+
+        if not room_str.isdigit():
+            self.console.insert(INSERT, "Invalid input! Please enter a valid room number.\n")
+            return
+
+        room_no = int(room_str)
+        self.worker.submit(self.checkout, room_no,
+                           on_done=lambda result: self.show_result(room_no, *result))
+
+    @metrics.timed("gui.check_out")
+    def checkout(self, room_no):
+        """Storage side of check_room (runs on the worker thread)."""
+        if not self.store:
+            return 0, None
+        # Drop the guest from the index, journal the checkout, free the
+        # room and archive the stay. The shared allocator, search index and
+        # stays are only changed on this thread
+        total = len(self.store)
+        record = self.store.delete(room_no)
+        if record is not None and self.rooms is not None:
+            self.rooms.release(room_no)
+        if record is not None and self.search is not None:
+            self.search.remove(record)
+        if record is not None and self.book is not None:
+            self.book.end_stay(record)
+        if record is not None and not getattr(self.store, "remote", False):
+            history.archive([record])
+        return total, record
+
+    def show_result(self, room_no, total, record):
+        """Report a finished checkout."""
+        if not total:
+            self.console.insert(INSERT, "No booking records found.\n")
+            return
+
+        if record is not None:
+            self.console.insert(INSERT, f"Thank you {record.name.upper()} for visiting us!\n")
+        else:
+            self.console.insert(INSERT, "No guest found with this room number.\n")
+
+
+# -----------------------------
+# Run Program
+# -----------------------------
+if __name__ == "__main__":
+    CheckoutApp()
@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Hotel Management - Fixed-Width Booking File
+struct records in a memory-mapped file, addressed by slot
+"""
+
+import heapq
+import mmap
+import os
+import pickle
+import struct
+import sys
+from collections import Counter
+from datetime import date
+
+import metrics
+from booking import Booking
+from storage import (SORT_KEYS, BookingStore, matches, mobile_of, page_of, replace_file,
+                     room_of)
+
+FIXED_FILE = "hotel.rec"
+
+MAGIC = b"HMR3"
+HEADER_SIZE = 8
+
+# status, name, address, mobile, room_no, price, days,
+# arrival, departure (date ordinals, 0 = no date), payment (0 = unknown)
+RECORD = struct.Struct("<B40s80s10sIdHIIB")
+
+# Earlier slot layouts by magic; such files are upgraded when opened
+OLD_RECORDS = {
+    b"HMR1": struct.Struct("<B40s80s10sIdH"),
+    b"HMR2": struct.Struct("<B40s80s10sIdHII"),
+}
+ROOM_FIELD = struct.Struct("<I")
+NAME_OFFSET = 1
+ROOM_OFFSET = 1 + 40 + 80 + 10
+
+FREE = 0
+ACTIVE = 1
+
+INITIAL_SLOTS = 64
+
+
+# -----------------------------
+# Encoding Helpers
+# -----------------------------
+def _text(value, width):
+    return str(value or "").encode("utf-8")[:width]
+
+
+def _ordinal(day):
+    return day.toordinal() if day else 0
+
+
+def _date(ordinal):
+    return date.fromordinal(ordinal) if ordinal else None
+
+
+def encode(record):
+    """Pack a booking record into one fixed-width slot."""
+    return RECORD.pack(
+        ACTIVE,
+        _text(record.name, 40),
+        _text(record.address, 80),
+        _text(mobile_of(record), 10),
+        room_of(record),
+        float(record.price or 0),
+        int(getattr(record, "days", 0) or 0),
+        _ordinal(getattr(record, "arrival", None)),
+        _ordinal(getattr(record, "departure", None)),
+        getattr(record, "payment", None) or 0,
+    )
+
+
+def decode(data, offset=0, layout=RECORD):
+    """Unpack one slot into a Booking (status is not returned)."""
+    fields = layout.unpack_from(data, offset)
+    _, name, address, mobile, room_no, price, days = fields[:7]
+    arrival, departure, payment = (fields[7:10] + (0, 0, 0))[:3]
+    if metrics.ENABLED:
+        metrics.add(bytes_read=layout.size, records_decoded=1)
+    return Booking(
+        name.rstrip(b"\0").decode("utf-8", "ignore"),
+        address.rstrip(b"\0").decode("utf-8", "ignore"),
+        mobile.rstrip(b"\0").decode("utf-8", "ignore"),
+        room_no,
+        price,
+        days,
+        _date(arrival),
+        _date(departure),
+        payment=payment or None,
+    )
+
+
+# -----------------------------
+# Fixed Record Store
+# -----------------------------
+class FixedRecordStore:
+    """Same API as BookingStore, backed by a memory-mapped slot file."""
+
+    def __init__(self, path=FIXED_FILE):
+        self.path = path
+        self.index = {}
+        self.free_slots = []
+        self.slots = 0
+        self.orders = {}
+        self._file = None
+        self._map = None
+        self.load()
+
+    # ----- File Handling -----
+    def _offset(self, slot):
+        return HEADER_SIZE + slot * RECORD.size
+
+    def _open(self):
+        if not os.path.exists(self.path):
+            with open(self.path, "wb") as f:
+                f.write(MAGIC.ljust(HEADER_SIZE, b"\0"))
+                f.write(b"\0" * (INITIAL_SLOTS * RECORD.size))
+        self._file = open(self.path, "r+b")
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        magic = self._map[:len(MAGIC)]
+        if magic in OLD_RECORDS:
+            self._upgrade(OLD_RECORDS[magic])
+        elif magic != MAGIC:
+            self.close()
+            raise ValueError(f"{self.path} is not a fixed-width booking file.")
+        self.slots = (len(self._map) - HEADER_SIZE) // RECORD.size
+
+    def _upgrade(self, layout):
+        """Rewrite a file in an older slot layout into the current one."""
+        records = []
+        for slot in range((len(self._map) - HEADER_SIZE) // layout.size):
+            offset = HEADER_SIZE + slot * layout.size
+            if self._map[offset] == ACTIVE:
+                records.append(decode(self._map, offset, layout))
+        self.close()
+        slots = max(INITIAL_SLOTS, len(records))
+        replace_file(self.path, [
+            MAGIC.ljust(HEADER_SIZE, b"\0"),
+            *(encode(record) for record in records),
+            b"\0" * ((slots - len(records)) * RECORD.size),
+        ])
+        self._file = open(self.path, "r+b")
+        self._map = mmap.mmap(self._file.fileno(), 0)
+
+    def _grow(self):
+        """Double the number of slots and remap the file."""
+        old = self.slots
+        self._map.resize(self._offset(old * 2))
+        self.slots = old * 2
+        for slot in range(old, self.slots):
+            heapq.heappush(self.free_slots, slot)
+
+    def close(self):
+        """Flush and unmap the file."""
+        if self._map is not None:
+            self._map.flush()
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    # ----- Persistence -----
+    def load(self):
+        """Map the file and index active slots by room number."""
+        self.close()
+        self._open()
+        self.index = {}
+        self.free_slots = []
+        self.orders = {}
+        for slot in range(self.slots):
+            offset = self._offset(slot)
+            if self._map[offset] == ACTIVE:
+                room = ROOM_FIELD.unpack_from(self._map, offset + ROOM_OFFSET)[0]
+                self.index[room] = slot
+            else:
+                self.free_slots.append(slot)
+
+    def save(self):
+        """Slots are updated in place; just flush the mapping."""
+        self._map.flush()
+
+    compact = save
+
+    # ----- Lookup -----
+    def get(self, room_no):
+        """Return the record for a room by reading its slot directly."""
+        slot = self.index.get(room_no)
+        if slot is None:
+            return None
+        return decode(self._map, self._offset(slot))
+
+    def rooms(self):
+        """Return the set of occupied room numbers."""
+        return set(self.index)
+
+    def __contains__(self, room_no):
+        return room_no in self.index
+
+    def __iter__(self):
+        for slot in sorted(self.index.values()):
+            yield decode(self._map, self._offset(slot))
+
+    def __len__(self):
+        return len(self.index)
+
+    def scan(self, room_no=None, rooms=None, name_prefix=None):
+        """Yield matching records, decoding only slots that pass the filters."""
+        if room_no is not None:
+            record = self.get(room_no)
+            if record is not None and matches(record, name_prefix):
+                yield record
+            return
+
+        prefix = name_prefix.upper().encode("utf-8") if name_prefix else None
+        for room, slot in sorted(self.index.items(), key=lambda item: item[1]):
+            if rooms is not None and room not in rooms:
+                continue
+            offset = self._offset(slot)
+            if prefix is not None:
+                name = self._map[offset + NAME_OFFSET:offset + NAME_OFFSET + len(prefix)]
+                if name.upper() != prefix:
+                    continue
+            yield decode(self._map, offset)
+
+    def page(self, offset, limit, sort="room", reverse=False):
+        """Return one page of records, decoding only the slots on it."""
+        order = self.orders.get(sort)
+        if order is None:
+            if sort == "room":
+                order = sorted(self.index)
+            else:
+                key = SORT_KEYS[sort]
+                order = sorted(self.index, key=lambda room: key(self.get(room), room))
+            self.orders[sort] = order
+        return [self.get(room) for room in page_of(order, offset, limit, reverse)]
+
+    # ----- Changes -----
+    def insert(self, record):
+        """Write a booking into the lowest free slot."""
+        room = room_of(record)
+        if room in self.index:
+            raise ValueError(f"Room {room} is already occupied.")
+        if not self.free_slots:
+            self._grow()
+        slot = heapq.heappop(self.free_slots)
+        offset = self._offset(slot)
+        self._map[offset:offset + RECORD.size] = encode(record)
+        if metrics.ENABLED:
+            metrics.add(bytes_written=RECORD.size)
+        self.index[room] = slot
+        self.orders = {}
+
+    def insert_many(self, records):
+        """Add a group of bookings, then flush the mapping once."""
+        records = list(records)
+        rooms = [room_of(record) for record in records]
+        counts = Counter(rooms)
+        taken = sorted(room for room in counts if room in self.index or counts[room] > 1)
+        if taken:
+            raise ValueError(f"Rooms already occupied: {taken}")
+        for record in records:
+            self.insert(record)
+        self._map.flush()
+
+    def delete_many(self, room_numbers):
+        """Clear several slots, then flush the mapping once."""
+        removed = [record for record in map(self.delete, room_numbers) if record is not None]
+        self._map.flush()
+        return removed
+
+    def delete(self, room_no):
+        """Clear a room's status byte in place and return its record."""
+        slot = self.index.pop(room_no, None)
+        if slot is None:
+            return None
+        offset = self._offset(slot)
+        record = decode(self._map, offset)
+        self._map[offset] = FREE
+        if metrics.ENABLED:
+            metrics.add(bytes_written=1)
+        self.orders = {}
+        heapq.heappush(self.free_slots, slot)
+        return record
+
+
+# -----------------------------
+# Format Converters
+# -----------------------------
+def pickle_to_fixed(src, dst):
+    """Copy the live bookings of a pickle file into a new fixed-width file."""
+    if os.path.exists(dst):
+        os.remove(dst)
+    target = FixedRecordStore(dst)
+    try:
+        for record in BookingStore(src):
+            target.insert(record)
+    finally:
+        target.close()
+
+
+def fixed_to_pickle(src, dst):
+    """Write the live bookings of a fixed-width file as a pickle stream."""
+    source = FixedRecordStore(src)
+    try:
+        replace_file(dst, (pickle.dumps(record, protocol=2) for record in source))
+    finally:
+        source.close()
+
+
+# -----------------------------
+# Run Program
+# -----------------------------
+if __name__ == "__main__":
+    converters = {"to-fixed": pickle_to_fixed, "to-pickle": fixed_to_pickle}
+    if len(sys.argv) != 4 or sys.argv[1] not in converters:
+        print("Usage: python fixedstore.py to-fixed|to-pickle SRC DST")
+        sys.exit(1)
+    converters[sys.argv[1]](sys.argv[2], sys.argv[3])
@@ -1,133 +1,207 @@
-#!/usr/bin/env python3
-# -*- coding: utf-8 -*-
-"""
-Hotel Management - Get Guest Info (Tkinter GUI)
-Refactored & Clean Version
-"""
-
-import os
-import sys
-import pickle
-from tkinter import *
-import tkinter.ttk as ttk
-
-
-# -----------------------------
-# Data Model
-# -----------------------------
-class Booking:
-    """Represents a hotel booking record."""
-
-    def __init__(self, name, address, mobile_no, room_no, price):
-        self.name = name
-        self.address = address
-        self.mobile_no = mobile_no
-        self.room_no = room_no
-        self.price = price
-
-
-# -----------------------------
-# Main Application
-# -----------------------------
-class GetInfoApp:
-    """Main application for retrieving guest info by room number."""
-
-    def __init__(self):
-        self.root = Tk()
-        self.root.geometry("900x600")
-        self.root.title("Hotel Management - Guest Info")
-        self.root.configure(background="#d9d9d9")
-
-        self.room_input = StringVar()
-        self.setup_ui()
-        self.root.mainloop()
-
-    # -----------------------------
-    # GUI Setup
-    # -----------------------------
-    def setup_ui(self):
-        """Setup all UI components."""
-        frame = Frame(self.root, bg="#d9d9d9", borderwidth=2, relief=GROOVE)
-        frame.place(relx=0.02, rely=0.03, relheight=0.94, relwidth=0.94)
-
-        # Title
-        Message(frame,
-                text="GET INFO HERE ..!!",
-                font=("Segoe UI", 28, "bold"),
-                bg="#d9d9d9",
-                width=460).place(relx=0.22, rely=0.02, relheight=0.12, relwidth=0.56)
-
-        # Label
-        Label(frame,
-              text="Enter Room No.:",
-              font=("Segoe UI", 20, "bold"),
-              bg="#d9d9d9").place(relx=0.12, rely=0.15, height=48, width=377)
-
-        # Entry
-        Entry(frame,
-              textvariable=self.room_input,
-              font=("Segoe UI", 14),
-              bg="white").place(relx=0.65, rely=0.17, height=40, relwidth=0.1)
-
-        # Submit button
-        Button(frame,
-               text="SUBMIT",
-               font=("Segoe UI", 17, "bold"),
-               bg="#d9d9d9",
-               command=self.get_info).place(relx=0.39, rely=0.29, height=74, width=197)
-
-        # Output text area
-        self.console = Text(frame,
-                            background="white",
-                            foreground="black",
-                            wrap=WORD,
-                            font=("Segoe UI", 12))
-        self.console.place(relx=0.04, rely=0.46, relheight=0.48, relwidth=0.93)
-
-    # -----------------------------
-    # Business Logic
-    # -----------------------------
-    def get_info(self):
-        """Fetch guest info for a given room number."""
-        room_str = self.room_input.get().strip()
-
-        # Validate input
-        if not room_str.isdigit():
-            self.console.insert(INSERT, "❌ Invalid room number!\n")
-            return
-
-        room_no = int(room_str)
-        found = False
-
-        try:
-            with open("hotel.dat", "rb") as f:
-                while True:
-                    try:
-                        booking = pickle.load(f)
-                        if booking.room_no == room_no:
-                            found = True
-                            self.display_info(booking)
-                            break
-                    except EOFError:
-                        break
-        except FileNotFoundError:
-            self.console.insert(INSERT, "⚠️ No booking records found.\n")
-            return
-
-        if not found:
-            self.console.insert(INSERT, f"❌ No guest found in room {room_no}\n")
-
-    def display_info(self, booking):
-        """Display booking info in the console box."""
-        self.console.insert(INSERT, f"✅ Guest Found in Room {booking.room_no}\n")
-        self.console.insert(INSERT, f"   Name: {booking.name}\n")
-        self.console.insert(INSERT, f"   Address: {booking.address}\n")
-        self.console.insert(INSERT, f"   Mobile: {booking.mobile_no}\n")
-        self.console.insert(INSERT, f"   Total Bill: ₹{booking.price}\n\n")
-
-
-# -----------------------------
-# Run Program
-# -----------------------------
-if __name__ == "__main__":
-    GetInfoApp()
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Hotel Management - Get Guest Info (Tkinter GUI)
+Refactored & Clean Version
+"""
+
+import os
+import sys
+from tkinter import *
+import tkinter.ttk as ttk
+
+import metrics
+from searchindex import GuestIndex
+from storage import apply_changes, mobile_of, open_store, room_of, store_changes
+from worker import BackgroundWorker
+
+# Search modes: (radio label, entry prompt)
+SEARCH_MODES = {
+    "room": ("Room No.", "Enter Room No.:"),
+    "name": ("Name", "Enter Name (start):"),
+    "mobile": ("Mobile", "Enter Mobile No.:"),
+}
+
+MAX_RESULTS = 50
+
+
+# -----------------------------
+# Main Application
+# -----------------------------
+class GetInfoApp:
+    """Main application for retrieving guest info by room, name or mobile."""
+
+    def __init__(self, master=None, store=None, search=None, rooms=None, book=None):
+        self.store = store if store is not None else open_store()
+        self.search = search
+        # The menu's allocator and stays, kept current with other desks' bookings
+        self.rooms = rooms
+        self.book = book
+
+        self.root = Tk() if master is None else Toplevel(master)
+        self.root.geometry("900x600")
+        self.root.title("Hotel Management - Guest Info")
+        self.root.configure(background="#d9d9d9")
+
+        self.room_input = StringVar()
+        self.mode = StringVar(value="room")
+        self.worker = BackgroundWorker(self.root)
+        self.setup_ui()
+        if self.search is None:
+            self.worker.submit(GuestIndex, self.store, on_done=self.index_ready)
+        if master is None:
+            self.root.mainloop()
+
+    # -----------------------------
+    # GUI Setup
+    # -----------------------------
+    def setup_ui(self):
+        """Setup all UI components."""
+        frame = Frame(self.root, bg="#d9d9d9", borderwidth=2, relief=GROOVE)
+        frame.place(relx=0.02, rely=0.03, relheight=0.94, relwidth=0.94)
+
+        # Title
+        Message(frame,
+                text="GET INFO HERE ..!!",
+                font=("Segoe UI", 28, "bold"),
+                bg="#d9d9d9",
+                width=460).place(relx=0.22, rely=0.02, relheight=0.12, relwidth=0.56)
+
+        # Label
+        self.prompt = Label(frame,
+                            text="Enter Room No.:",
+                            font=("Segoe UI", 20, "bold"),
+                            bg="#d9d9d9")
+        self.prompt.place(relx=0.12, rely=0.15, height=48, width=377)
+
+        # Entry
+        Entry(frame,
+              textvariable=self.room_input,
+              font=("Segoe UI", 14),
+              bg="white").place(relx=0.6, rely=0.17, height=40, relwidth=0.3)
+
+        # Search mode
+        for i, (mode, (text, _)) in enumerate(SEARCH_MODES.items()):
+            Radiobutton(frame,
+                        text=text,
+                        value=mode,
+                        variable=self.mode,
+                        command=self.change_mode,
+                        font=("Segoe UI", 12),
+                        bg="#d9d9d9").place(relx=0.3 + i * 0.15, rely=0.25)
+
+        # Submit button
+        Button(frame,
+               text="SUBMIT",
+               font=("Segoe UI", 17, "bold"),
+               bg="#d9d9d9",
+               command=self.get_info).place(relx=0.39, rely=0.32, height=74, width=197)
+
+        # Output text area
+        self.console = Text(frame,
+                            background="white",
+                            foreground="black",
+                            wrap=WORD,
+                            font=("Segoe UI", 12))
+        self.console.place(relx=0.04, rely=0.46, relheight=0.48, relwidth=0.93)
+
+    # -----------------------------
+    # Business Logic
+    # -----------------------------
+    def index_ready(self, search):
+        self.search = search
+
+    def change_mode(self):
+        """Relabel the entry for the selected search mode."""
+        self.prompt.configure(text=SEARCH_MODES[self.mode.get()][1])
+
+    def get_info(self):
+        """Fetch guest info for a room number, name prefix or mobile number."""
+        if self.mode.get() != "room":
+            self.search_guests()
+            return
+
+        room_str = self.room_input.get().strip()
+
+        # Validate input
+        if not room_str.isdigit():
+            self.console.insert(INSERT, "❌ Invalid room number!\n")
+            return
+
+        room_no = int(room_str)
+
+        # Look the room up on the worker thread; the window stays responsive
+        self.worker.submit(self.lookup, room_no,
+                           on_done=lambda result: self.show_result(room_no, *result))
+
+    def sync(self):
+        """Pick up bookings other desks saved since the last query (runs on
+        the worker thread, the only one that changes the shared indexes)."""
+        apply_changes(self.store, self.rooms, self.search, self.book, *store_changes(self.store))
+
+    @metrics.timed("gui.get_info")
+    def lookup(self, room_no):
+        """Storage side of get_info (runs on the worker thread)."""
+        self.sync()
+        return len(self.store), self.store.get(room_no)
+
+    def show_result(self, room_no, total, booking):
+        """Report a finished lookup."""
+        if not total:
+            self.console.insert(INSERT, "⚠️ No booking records found.\n")
+            return
+
+        if booking is None:
+            self.console.insert(INSERT, f"❌ No guest found in room {room_no}\n")
+            return
+        self.display_info(booking)
+
+    def search_guests(self):
+        """Look guests up in the name / mobile index."""
+        query = self.room_input.get().strip()
+        if self.search is None:
+            self.console.insert(INSERT, "⏳ Search index is still loading, try again.\n")
+            return
+
+        mode = self.mode.get()
+        if mode == "name" and not query:
+            self.console.insert(INSERT, "❌ Invalid name!\n")
+            return
+        if mode == "mobile" and not (query.isdigit() and len(query) == 10):
+            self.console.insert(INSERT, "❌ Invalid mobile number!\n")
+            return
+        self.worker.submit(self.find, mode, query,
+                           on_done=lambda bookings: self.show_matches(query, bookings))
+
+    @metrics.timed("gui.search")
+    def find(self, mode, query):
+        """Storage side of search_guests (runs on the worker thread)."""
+        self.sync()
+        if mode == "name":
+            rooms = self.search.by_name(query, limit=MAX_RESULTS)
+        else:
+            rooms = self.search.by_mobile(query)
+        return [self.store.get(room) for room in rooms]
+
+    def show_matches(self, query, bookings):
+        if not bookings:
+            self.console.insert(INSERT, f"❌ No guest found for '{query}'\n")
+            return
+        for booking in bookings:
+            if booking is not None:
+                self.display_info(booking)
+
+    def display_info(self, booking):
+        """Display booking info in the console box."""
+        self.console.insert(INSERT, f"✅ Guest Found in Room {room_of(booking)}\n")
+        self.console.insert(INSERT, f"   Name: {booking.name}\n")
+        self.console.insert(INSERT, f"   Address: {booking.address}\n")
+        self.console.insert(INSERT, f"   Mobile: {mobile_of(booking)}\n")
+        self.console.insert(INSERT, f"   Total Bill: ₹{booking.price}\n\n")
+
+
+# -----------------------------
+# Run Program
+# -----------------------------
+if __name__ == "__main__":
+    GetInfoApp()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Hotel Management - Stay History
+Checked-out stays in append-only monthly segment files
+
+Usage:
+    python history.py [--from YYYY-MM-DD] [--to YYYY-MM-DD]
+"""
+
+import os
+import pickle
+import sys
+from datetime import date, datetime
+
+import metrics
+from storage import iter_records, log_for, room_of
+
+HISTORY_DIR = "history"
+
+
+# -----------------------------
+# Segments
+# -----------------------------
+def segment_path(day, directory=HISTORY_DIR):
+    """history/YYYY-MM.dat holding the stays checked out in that month."""
+    return os.path.join(directory, f"{day:%Y-%m}.dat")
+
+
+def segments(start=None, end=None, directory=HISTORY_DIR):
+    """Segment paths, oldest first, for months overlapping [start, end]."""
+    try:
+        names = sorted(os.listdir(directory))
+    except FileNotFoundError:
+        return []
+    first = f"{start:%Y-%m}" if start else ""
+    last = f"{end:%Y-%m}" if end else "9999-99"
+    return [os.path.join(directory, name) for name in names
+            if name.endswith(".dat") and first <= name[:-4] <= last]
+
+
+# -----------------------------
+# Archive / Read
+# -----------------------------
+@metrics.timed("history.archive")
+def archive(records, on=None, directory=HISTORY_DIR):
+    """Append checked-out records to the month's segment, stamped with
+    their checkout date; one write per segment."""
+    on = on or date.today()
+    records = list(records)
+    if not records:
+        return
+    for record in records:
+        record.checked_out = on
+    os.makedirs(directory, exist_ok=True)
+    # Same durability as the booking journal (STAYMITAR_DURABILITY)
+    log_for(segment_path(on, directory)).append(
+        b"".join(pickle.dumps(record, protocol=2) for record in records))
+
+
+def scan_history(start=None, end=None, directory=HISTORY_DIR):
+    """Yield archived stays checked out between start and end (inclusive),
+    opening only the segments for those months."""
+    for path in segments(start, end, directory):
+        for record in iter_records(path):
+            day = getattr(record, "checked_out", None)
+            if (start and day < start) or (end and day > end):
+                continue
+            yield record
+
+
+# -----------------------------
+# Run Program
+# -----------------------------
+def parse_range(argv):
+    """--from / --to dates from the command line."""
+    bounds = {"--from": None, "--to": None}
+    for flag in bounds:
+        if flag in argv:
+            bounds[flag] = datetime.strptime(argv[argv.index(flag) + 1], "%Y-%m-%d").date()
+    return bounds["--from"], bounds["--to"]
+
+
+def main(argv):
+    start, end = parse_range(argv)
+    shown = 0
+    for record in scan_history(start, end):
+        if not shown:
+            print(f"{'Checked out':<12} {'Room':<6} {'Name':<20} {'Bill':>10}")
+            print("-" * 51)
+        print(f"{record.checked_out!s:<12} {room_of(record)!s:<6} {record.name:<20} "
+              f"{record.price:>10}")
+        shown += 1
+    if not shown:
+        print("No archived stays in that range.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Hotel Management - Room Inventory
+Room categories, floors and rates loaded from inventory.json
+"""
+
+import json
+import os
+from bisect import bisect_right
+
+INVENTORY_FILE = os.environ.get("STAYMITAR_INVENTORY", "inventory.json")
+
+# Used when no inventory file exists: the original 50-room hotel
+DEFAULT_CONFIG = {
+    "categories": {
+        "1": {"name": "Deluxe", "rate": 2000, "rooms": [[1, 10]]},
+        "2": {"name": "Semi-Deluxe", "rate": 1500, "rooms": [[11, 25]]},
+        "3": {"name": "General", "rate": 1000, "rooms": [[26, 45]]},
+        "4": {"name": "Joint", "rate": 1700, "rooms": [[46, 50]]},
+    },
+    "floors": [],
+}
+
+
+# -----------------------------
+# Room Ranges
+# -----------------------------
+class RoomRanges:
+    """Inclusive room-number ranges that behave like a sorted room list
+    (`in`, len, iteration) without expanding every room number."""
+
+    def __init__(self, ranges):
+        self.ranges = sorted((int(start), int(end)) for start, end in ranges)
+        self.starts = [start for start, _ in self.ranges]
+
+    def __contains__(self, room):
+        i = bisect_right(self.starts, room) - 1
+        return i >= 0 and room <= self.ranges[i][1]
+
+    def __iter__(self):
+        for start, end in self.ranges:
+            yield from range(start, end + 1)
+
+    def __len__(self):
+        return sum(end - start + 1 for start, end in self.ranges)
+
+    def __repr__(self):
+        return f"RoomRanges({self.ranges})"
+
+
+# -----------------------------
+# Inventory
+# -----------------------------
+class Inventory:
+    """Categories as room ranges, plus per-floor attributes, surcharges
+    and pricing rules."""
+
+    def __init__(self, config):
+        self.categories = {}
+        spans = []
+        for key, info in config["categories"].items():
+            category = int(key)
+            rooms = RoomRanges(info["rooms"])
+            self.categories[category] = {"name": info["name"], "rate": info["rate"], "rooms": rooms}
+            spans += [(start, end, category) for start, end in rooms.ranges]
+
+        spans.sort()
+        for (_, end, _), (start, _, _) in zip(spans, spans[1:]):
+            if start <= end:
+                raise ValueError(f"Room {start} belongs to more than one category.")
+        self.spans = spans
+        self.span_starts = [start for start, _, _ in spans]
+
+        self.floors = sorted(
+            ((int(f["rooms"][0]), int(f["rooms"][1]), f) for f in config.get("floors", [])),
+            key=lambda floor: (floor[0], floor[1]),
+        )
+        for (_, end, _), (start, _, _) in zip(self.floors, self.floors[1:]):
+            if start <= end:
+                raise ValueError(f"Room {start} is on more than one floor.")
+        self.floor_starts = [start for start, _, _ in self.floors]
+
+        # Seasonal / weekday / occupancy / long-stay rules (see pricing.py)
+        self.pricing = config.get("pricing", {})
+
+    @classmethod
+    def load(cls, path=INVENTORY_FILE):
+        """Read an inventory file, falling back to the built-in 50 rooms."""
+        try:
+            with open(path, encoding="utf-8") as f:
+                return cls(json.load(f))
+        except FileNotFoundError:
+            return cls(DEFAULT_CONFIG)
+
+    # ----- Lookup -----
+    def room_types(self):
+        """ROOM_TYPES-style dict used by both front ends."""
+        return {
+            category: {"name": info["name"], "rate": info["rate"], "price": info["rate"],
+                       "rooms": info["rooms"]}
+            for category, info in sorted(self.categories.items())
+        }
+
+    def category_of(self, room):
+        """Category of a room number, or None if the hotel has no such room."""
+        i = bisect_right(self.span_starts, room) - 1
+        if i >= 0 and room <= self.spans[i][1]:
+            return self.spans[i][2]
+        return None
+
+    def floor_of(self, room):
+        """Floor entry (floor, wing, attributes, surcharge ...) for a room."""
+        i = bisect_right(self.floor_starts, room) - 1
+        if i >= 0 and room <= self.floors[i][1]:
+            return self.floors[i][2]
+        return None
+
+    def rate_of(self, room):
+        """Daily rate of a room: its category rate plus any floor surcharge."""
+        category = self.category_of(room)
+        if category is None:
+            raise KeyError(f"Room {room} is not in the inventory.")
+        floor = self.floor_of(room) or {}
+        return self.categories[category]["rate"] + floor.get("surcharge", 0)
+
+
+INVENTORY = Inventory.load()
+ROOM_TYPES = INVENTORY.room_types()
@@ -1,120 +1,169 @@
-#!/usr/bin/env python3
-# -*- coding: utf-8 -*-
-"""
-Hotel Management - Guest List Viewer (Tkinter GUI)
-Refactored & Clean Version
-"""
-
-import pickle
-from tkinter import *
-import tkinter.ttk as ttk
-
-
-# -----------------------------
-# Data Model
-# -----------------------------
-class Booking:
-    """Represents a hotel booking record."""
-
-    def __init__(self, name, address, mobile_no, room_no, price):
-        self.name = name
-        self.address = address
-        self.mobile_no = mobile_no
-        self.room_no = room_no
-        self.price = price
-
-
-# -----------------------------
-# Main Application
-# -----------------------------
-class GuestListApp:
-    """Displays list of all guests and their room numbers."""
-
-    def __init__(self):
-        self.guest_names = []
-        self.room_numbers = []
-
-        self.load_data()
-
-        # Tkinter Setup
-        self.root = Tk()
-        self.root.geometry("800x550")
-        self.root.title("Hotel Management - Guest List")
-        self.root.configure(background="white")
-
-        self.setup_ui()
-        self.root.mainloop()
-
-    # -----------------------------
-    # Load Data
-    # -----------------------------
-    def load_data(self):
-        """Load guest data from hotel.dat."""
-        try:
-            with open("hotel.dat", "rb") as f:
-                while True:
-                    try:
-                        record = pickle.load(f)
-                        self.guest_names.append(record.name.upper())
-                        self.room_numbers.append(record.room_no)
-                    except EOFError:
-                        break
-        except FileNotFoundError:
-            self.guest_names = []
-            self.room_numbers = []
-
-    # -----------------------------
-    # GUI Setup
-    # -----------------------------
-    def setup_ui(self):
-        """Setup UI for listing guests and room numbers."""
-        label_frame = LabelFrame(self.root,
-                                 text="List of All Guests",
-                                 font=("Segoe UI", 16, "bold"),
-                                 bg="white")
-        label_frame.place(relx=0.02, rely=0.05, relheight=0.9, relwidth=0.95)
-
-        # Left frame → Guest Names
-        frame_left = Frame(label_frame, bg="#f0f0f0", borderwidth=2, relief=GROOVE)
-        frame_left.place(relx=0.03, rely=0.1, relheight=0.85, relwidth=0.45)
-
-        Label(frame_left,
-              text="Guest Names",
-              font=("Segoe UI", 14, "bold"),
-              bg="#f0f0f0").pack(pady=5)
-
-        self.text_names = Text(frame_left, font=("Times New Roman", 14), wrap=WORD)
-        self.text_names.pack(fill=BOTH, expand=True, padx=10, pady=5)
-
-        # Right frame → Room Numbers
-        frame_right = Frame(label_frame, bg="#f0f0f0", borderwidth=2, relief=GROOVE)
-        frame_right.place(relx=0.52, rely=0.1, relheight=0.85, relwidth=0.45)
-
-        Label(frame_right,
-              text="Room Numbers",
-              font=("Segoe UI", 14, "bold"),
-              bg="#f0f0f0").pack(pady=5)
-
-        self.text_rooms = Text(frame_right, font=("Times New Roman", 14), wrap=WORD)
-        self.text_rooms.pack(fill=BOTH, expand=True, padx=10, pady=5)
-
-        # Populate lists
-        self.populate_lists()
-
-    # -----------------------------
-    # Populate UI
-    # -----------------------------
-    def populate_lists(self):
-        """Insert guest names and room numbers into text areas."""
-        for name in self.guest_names:
-            self.text_names.insert(INSERT, name + "\n")
-
-        for room in self.room_numbers:
-            self.text_rooms.insert(INSERT, str(room) + "\n")
-
-
-# -----------------------------
-# Run Program
-# -----------------------------
-if __name__ == "__main__":
-    GuestListApp()
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Hotel Management - Guest List Viewer (Tkinter GUI)
+Refactored & Clean Version
+"""
+
+from tkinter import *
+import tkinter.ttk as ttk
+
+import metrics
+from storage import apply_changes, open_store, room_of, store_changes
+from worker import BackgroundWorker
+
+
+# -----------------------------
+# Main Application
+# -----------------------------
+class GuestListApp:
+    """Displays guests in a paged Treeview; only the visible rows are fetched."""
+
+    PAGE_SIZE = 20
+    COLUMNS = (("room", "Room No.", 120), ("name", "Guest Name", 360), ("bill", "Total Bill", 160))
+
+    def __init__(self, master=None, store=None, rooms=None, search=None, book=None):
+        self.store = store if store is not None else open_store()
+        # The menu's allocator, search index and stays, kept current with
+        # the bookings other desks save
+        self.rooms = rooms
+        self.search = search
+        self.book = book
+        self.total = 0
+        self.offset = 0
+        self.sort = "room"
+        self.reverse = False
+        self.wanted = None
+
+        # Tkinter Setup
+        self.root = Tk() if master is None else Toplevel(master)
+        self.root.geometry("800x550")
+        self.root.title("Hotel Management - Guest List")
+        self.root.configure(background="white")
+        self.worker = BackgroundWorker(self.root)
+
+        self.setup_ui()
+        self.load_data()
+        if master is None:
+            self.root.mainloop()
+
+    # -----------------------------
+    # Load Data
+    # -----------------------------
+    def load_data(self):
+        """Fetch the page at self.offset in the background."""
+        if self.worker.busy:
+            # Coalesce fast scrolling into one fetch of the latest page
+            self.wanted = (self.offset, self.sort, self.reverse)
+            return
+        self.wanted = None
+        self.worker.submit(self.read_page, self.offset, self.sort, self.reverse,
+                           on_done=self.populate_page)
+
+    @metrics.timed("gui.guest_list")
+    def read_page(self, offset, sort, reverse):
+        """Storage side of load_data (runs on the worker thread)."""
+        # Another desk may have changed hotel.dat; the shared indexes are
+        # only changed on this thread
+        apply_changes(self.store, self.rooms, self.search, self.book, *store_changes(self.store))
+        rows = [(room_of(record), record.name.upper(), record.price)
+                for record in self.store.page(offset, self.PAGE_SIZE, sort, reverse)]
+        return len(self.store), offset, rows
+
+    # -----------------------------
+    # GUI Setup
+    # -----------------------------
+    def setup_ui(self):
+        """Setup UI for listing guests and room numbers."""
+        label_frame = LabelFrame(self.root,
+                                 text="List of All Guests",
+                                 font=("Segoe UI", 16, "bold"),
+                                 bg="white")
+        label_frame.place(relx=0.02, rely=0.05, relheight=0.9, relwidth=0.95)
+
+        frame = Frame(label_frame, bg="#f0f0f0", borderwidth=2, relief=GROOVE)
+        frame.place(relx=0.03, rely=0.05, relheight=0.82, relwidth=0.94)
+
+        # One Treeview row per visible guest; the scrollbar spans all guests
+        self.tree = ttk.Treeview(frame,
+                                 columns=[key for key, _, _ in self.COLUMNS],
+                                 show="headings",
+                                 height=self.PAGE_SIZE,
+                                 selectmode="browse")
+        for key, title, width in self.COLUMNS:
+            self.tree.heading(key, text=title, command=lambda k=key: self.sort_by(k))
+            self.tree.column(key, width=width, anchor=W)
+        self.tree.pack(side=LEFT, fill=BOTH, expand=True, padx=(10, 0), pady=5)
+
+        self.scrollbar = ttk.Scrollbar(frame, orient=VERTICAL, command=self.on_scroll)
+        self.scrollbar.pack(side=RIGHT, fill=Y, padx=(0, 10), pady=5)
+
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.tree.bind(sequence, self.on_wheel)
+        self.tree.bind("<Prior>", lambda e: self.scroll_to(self.offset - self.PAGE_SIZE))
+        self.tree.bind("<Next>", lambda e: self.scroll_to(self.offset + self.PAGE_SIZE))
+
+        self.status = Label(label_frame, text="Loading...", font=("Segoe UI", 11), bg="white")
+        self.status.place(relx=0.03, rely=0.89)
+
+    # -----------------------------
+    # Scrolling & Sorting
+    # -----------------------------
+    def scroll_to(self, offset):
+        """Move the window of visible rows and fetch that page."""
+        offset = max(0, min(int(offset), self.total - self.PAGE_SIZE))
+        if offset != self.offset:
+            self.offset = offset
+            self.load_data()
+
+    def on_scroll(self, action, amount, unit=None):
+        """Scrollbar command: 'moveto fraction' or 'scroll n units|pages'."""
+        if action == "moveto":
+            self.scroll_to(float(amount) * self.total)
+        elif action == "scroll":
+            step = self.PAGE_SIZE if unit == "pages" else 1
+            self.scroll_to(self.offset + int(amount) * step)
+
+    def on_wheel(self, event):
+        if getattr(event, "num", None) == 4 or getattr(event, "delta", 0) > 0:
+            self.scroll_to(self.offset - 3)
+        else:
+            self.scroll_to(self.offset + 3)
+        return "break"
+
+    def sort_by(self, key):
+        """Sort by a column; clicking the same heading again reverses it."""
+        self.reverse = not self.reverse if key == self.sort else False
+        self.sort = key
+        self.offset = 0
+        self.load_data()
+
+    # -----------------------------
+    # Populate UI
+    # -----------------------------
+    def populate_page(self, result):
+        """Replace the visible rows with a freshly fetched page."""
+        self.total, offset, rows = result
+        if self.wanted is not None:
+            self.load_data()
+            return
+
+        self.tree.delete(*self.tree.get_children())
+        for room, name, bill in rows:
+            self.tree.insert("", END, values=(room, name, f"₹{bill}"))
+
+        if self.total:
+            first = offset / self.total
+            self.scrollbar.set(first, min(first + len(rows) / self.total, 1.0))
+            self.status.configure(
+                text=f"Guests {offset + 1}-{offset + len(rows)} of {self.total}")
+        else:
+            self.scrollbar.set(0.0, 1.0)
+            self.status.configure(text="No guests currently checked in.")
+
+
+# -----------------------------
+# Run Program
+# -----------------------------
+if __name__ == "__main__":
+    GuestListApp()
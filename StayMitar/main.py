@@ -1,194 +1,453 @@
-#!/usr/bin/env python3
-# -*- coding: utf-8 -*-
-"""
-Hotel Management System - Console Application
-Refactored & Clean Version
-"""
-
-import os
-import pickle
-
-
-# -----------------------------
-# Data Model
-# -----------------------------
-class Guest:
-    """Represents a hotel guest booking."""
-
-    def __init__(self, name, address, mobile_no, days, room=None, price=0):
-        self.name = name
-        self.address = address
-        self.mobile_no = mobile_no
-        self.days = days
-        self.room = room
-        self.price = price
-
-
-# -----------------------------
-# Constants
-# -----------------------------
-ROOM_TYPES = {
-    1: {"name": "Deluxe", "rate": 2000, "rooms": list(range(1, 11))},
-    2: {"name": "Semi-Deluxe", "rate": 1500, "rooms": list(range(11, 26))},
-    3: {"name": "General", "rate": 1000, "rooms": list(range(26, 46))},
-    4: {"name": "Joint", "rate": 1700, "rooms": [46, 47, 48, 49, 50]},
-}
-
-
-# -----------------------------
-# Input Validators
-# -----------------------------
-def input_text(prompt: str) -> str:
-    """Ask for non-empty text input."""
-    while True:
-        val = input(prompt).strip()
-        if val and not val.isdigit():
-            return val
-        print("❌ Invalid input. Please try again.")
-
-
-def input_number(prompt: str, length=None) -> str:
-    """Ask for numeric input with optional fixed length."""
-    while True:
-        val = input(prompt).strip()
-        if val.isdigit() and (length is None or len(val) == length):
-            return val
-        print("❌ Invalid number. Please try again.")
-
-
-def input_choice(prompt: str, choices: list[str]) -> str:
-    """Ask for a choice from a list of options."""
-    while True:
-        val = input(prompt).strip()
-        if val in choices:
-            return val
-        print(f"❌ Invalid choice. Choose from {choices}.")
-
-
-# -----------------------------
-# Hotel Operations
-# -----------------------------
-class HotelSystem:
-    """Hotel management system logic."""
-
-    DATA_FILE = "hotel.dat"
-
-    def __init__(self):
-        self.guests = self.load_guests()
-
-    # ----- Persistence -----
-    def load_guests(self):
-        guests = []
-        try:
-            with open(self.DATA_FILE, "rb") as f:
-                while True:
-                    try:
-                        guests.append(pickle.load(f))
-                    except EOFError:
-                        break
-        except FileNotFoundError:
-            pass
-        return guests
-
-    def save_guests(self):
-        with open(self.DATA_FILE, "wb") as f:
-            for guest in self.guests:
-                pickle.dump(guest, f, protocol=2)
-
-    # ----- Booking -----
-    def check_in(self):
-        print("\n--- Guest Check-in ---")
-        name = input_text("Enter guest name: ")
-        address = input_text("Enter guest address: ")
-        mobile_no = input_number("Enter mobile number (10 digits): ", length=10)
-        days = int(input_number("Enter number of days: "))
-
-        # Choose room type
-        print("\nRoom Types:")
-        for k, v in ROOM_TYPES.items():
-            print(f"{k}. {v['name']} - ₹{v['rate']} per day")
-        choice = int(input_choice("Choose room type (1-4): ", ["1", "2", "3", "4"]))
-
-        # Calculate price
-        base_price = ROOM_TYPES[choice]["rate"] * days
-
-        # Payment method
-        print("\nPayment Method:")
-        print("1. Cash (No discount)")
-        print("2. Card (10% discount)")
-        pay_choice = int(input_choice("Choose payment method (1/2): ", ["1", "2"]))
-        if pay_choice == 2:
-            base_price -= base_price * 0.10
-
-        # Assign room
-        allocated_rooms = [g.room for g in self.guests]
-        room_no = None
-        for r in ROOM_TYPES[choice]["rooms"]:
-            if r not in allocated_rooms:
-                room_no = r
-                break
-        if not room_no:
-            print("❌ No rooms available in this category.")
-            return
-
-        guest = Guest(name, address, mobile_no, days, room_no, base_price)
-        self.guests.append(guest)
-        self.save_guests()
-
-        print(f"\n✅ Check-in successful! {guest.name} allocated Room {guest.room}.")
-        print(f"Total Bill: ₹{guest.price}\n")
-
-    # ----- Show List -----
-    def show_guest_list(self):
-        print("\n--- Guest List ---")
-        if not self.guests:
-            print("No guests currently checked in.")
-            return
-        print(f"{'Name':<20} {'Room No.':<10}")
-        print("-" * 30)
-        for g in self.guests:
-            print(f"{g.name:<20} {g.room:<10}")
-
-    # ----- Checkout -----
-    def check_out(self):
-        print("\n--- Guest Checkout ---")
-        room_no = int(input_number("Enter room number: "))
-        found = False
-        updated_guests = []
-        for g in self.guests:
-            if g.room == room_no:
-                found = True
-                print(f"✅ Guest {g.name} has checked out. Thank you for staying with us!")
-            else:
-                updated_guests.append(g)
-        if not found:
-            print("❌ No guest found in that room.")
-        self.guests = updated_guests
-        self.save_guests()
-
-    # ----- Get Info -----
-    def get_info(self):
-        print("\n--- Get Guest Info ---")
-        room_no = int(input_number("Enter room number: "))
-        found = False
-        for g in self.guests:
-            if g.room == room_no:
-                found = True
-                print(f"\n✅ Guest Found in Room {g.room}")
-                print(f"   Name: {g.name}")
-                print(f"   Address: {g.address}")
-                print(f"   Mobile: {g.mobile_no}")
-                print(f"   Total Bill: ₹{g.price}")
-        if not found:
-            print("❌ No guest found in that room.")
-
-
-# -----------------------------
-# Main Menu
-# -----------------------------
-def main():
-    system = HotelSystem()
-    while True:
-        print("\n================ HOTEL MANAGEMENT SYSTEM ================")
-        print("1. Check-in Guest")
-        print("2. Show Guest List")
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Hotel Management System - Console Application
+Refactored & Clean Version
+"""
+
+import os
+import time
+from datetime import date, datetime
+
+import history
+import metrics
+import snapshot
+from allocator import RoomAllocator
+from booking import Booking
+from inventory import ROOM_TYPES
+from pricing import PRICING, occupancy
+from reservations import Reservation, ReservationBook, allocate_stay, stay_dates
+from searchindex import GuestIndex
+from storage import STORE_FORMAT, mobile_of, open_store, room_of
+
+
+# -----------------------------
+# Pricing
+# -----------------------------
+def calculate_price(choice: int, days: int, pay_choice: int, room=None,
+                    arrival=None, share=0.0) -> float:
+    """Quote a stay from the pricing rules, less the card discount (pay_choice 2).
+
+    With a room number the rate includes its floor surcharge; share is
+    how full the category is, for the occupancy surcharge.
+    """
+    return PRICING.quote(choice, days, pay_choice, arrival, share, room)
+
+
+# -----------------------------
+# Input Validators
+# -----------------------------
+def is_valid_text(val: str) -> bool:
+    """Non-empty text that is not just a number."""
+    return bool(val) and not val.isdigit()
+
+
+def is_valid_number(val: str, length=None) -> bool:
+    """Digits only, optionally of a fixed length."""
+    return val.isdigit() and (length is None or len(val) == length)
+
+
+def input_text(prompt: str) -> str:
+    """Ask for non-empty text input."""
+    while True:
+        val = input(prompt).strip()
+        if is_valid_text(val):
+            return val
+        print("❌ Invalid input. Please try again.")
+
+
+def input_number(prompt: str, length=None) -> str:
+    """Ask for numeric input with optional fixed length."""
+    while True:
+        val = input(prompt).strip()
+        if is_valid_number(val, length):
+            return val
+        print("❌ Invalid number. Please try again.")
+
+
+def input_choice(prompt: str, choices: list[str]) -> str:
+    """Ask for a choice from a list of options."""
+    while True:
+        val = input(prompt).strip()
+        if val in choices:
+            return val
+        print(f"❌ Invalid choice. Choose from {choices}.")
+
+
+def input_date(prompt: str) -> date:
+    """Ask for a date (YYYY-MM-DD) that is not in the past."""
+    while True:
+        val = input(prompt).strip()
+        try:
+            day = datetime.strptime(val, "%Y-%m-%d").date()
+        except ValueError:
+            print("❌ Invalid date. Use YYYY-MM-DD.")
+            continue
+        if day >= date.today():
+            return day
+        print("❌ Date is in the past.")
+
+
+# -----------------------------
+# Hotel Operations
+# -----------------------------
+class HotelSystem:
+    """Hotel management system logic."""
+
+    def __init__(self, store=None):
+        warm = None
+        if store is None and STORE_FORMAT == "pickle":
+            # Last run's snapshot plus whatever was appended since
+            warm = snapshot.load()
+        if warm is not None:
+            self.store, self.rooms, self.search, self.book = warm
+        else:
+            self.store = store if store is not None else open_store()
+            if getattr(self.store, "remote", False):
+                # The booking service keeps these; share its copies
+                self.rooms, self.search, self.book = self.store.proxies()
+            else:
+                self.rooms = RoomAllocator(ROOM_TYPES, self.store.rooms())
+                self.search = GuestIndex(self.store)
+                self.book = ReservationBook(self.store)
+        self.snapshot_at = time.monotonic()
+
+    def save_snapshot(self, force=True):
+        """Write the warm-start snapshot; unless forced, only once
+        SNAPSHOT_INTERVAL has passed since the last one."""
+        interval = snapshot.SNAPSHOT_INTERVAL
+        if not force and (not interval or time.monotonic() - self.snapshot_at < interval):
+            return
+        snapshot.save(self.store, self.rooms, self.search, self.book)
+        self.snapshot_at = time.monotonic()
+
+    # ----- Booking -----
+    def check_in(self):
+        print("\n--- Guest Check-in ---")
+        name = input_text("Enter guest name: ")
+        address = input_text("Enter guest address: ")
+        mobile_no = input_number("Enter mobile number (10 digits): ", length=10)
+        days = int(input_number("Enter number of days: "))
+
+        # Choose room type, quoting the whole stay in each
+        print("\nRoom Types:")
+        quotes = PRICING.quotes(days, rooms=self.rooms)
+        for k, v in ROOM_TYPES.items():
+            print(f"{k}. {v['name']} - ₹{v['rate']} per day, ₹{quotes[k]} for {days} day(s) "
+                  f"({self.rooms.vacancy(k)} free)")
+        choice = int(input_choice(f"Choose room type ({', '.join(map(str, ROOM_TYPES))}): ",
+                                  [str(k) for k in ROOM_TYPES]))
+
+        # Payment method
+        print("\nPayment Method:")
+        print("1. Cash (No discount)")
+        print(f"2. Card ({PRICING.card_discount:.0%} discount)")
+        pay_choice = int(input_choice("Choose payment method (1/2): ", ["1", "2"]))
+
+        # Assign a room with no reservation during the stay, then price it
+        with metrics.timer("check_in"):
+            arrival, departure = stay_dates(days)
+            share = occupancy(self.rooms, choice)
+            room_no = allocate_stay(self.rooms, self.book, choice, arrival, departure)
+            if not room_no:
+                print("❌ No rooms available in this category.")
+                return
+
+            base_price = calculate_price(choice, days, pay_choice, room_no, arrival, share)
+            guest = Booking(name, address, mobile_no, room_no, base_price, days, arrival, departure,
+                            payment=pay_choice)
+            self.store.insert(guest)
+            self.search.add(guest)
+            self.book.start_stay(guest)
+
+        print(f"\n✅ Check-in successful! {guest.name} allocated Room {guest.room_no}.")
+        print(f"Total Bill: ₹{guest.price}\n")
+
+    # ----- Group Booking -----
+    @metrics.timed("check_in_batch")
+    def check_in_batch(self, rows):
+        """Check in a whole group in one write.
+
+        rows are dicts with name, address, mobile_no, days, room_type
+        (number or name) and optional payment (1/cash, 2/card). Every row
+        is validated and every room allocated before anything is saved;
+        on any problem nothing is written and ValueError lists them all.
+        """
+        type_ids = {str(k): k for k in ROOM_TYPES}
+        type_ids.update({v["name"].lower(): k for k, v in ROOM_TYPES.items()})
+        pay_ids = {"": 1, "1": 1, "cash": 1, "2": 2, "card": 2}
+
+        errors, wanted = [], {}
+        for line, row in enumerate(rows, start=1):
+            name = str(row.get("name", "")).strip()
+            address = str(row.get("address", "")).strip()
+            mobile_no = str(row.get("mobile_no", row.get("mobile", ""))).strip()
+            days = str(row.get("days", "")).strip()
+            choice = type_ids.get(str(row.get("room_type", "")).strip().lower())
+            pay_choice = pay_ids.get(str(row.get("payment", "")).strip().lower())
+
+            problems = [field for field, ok in (
+                ("name", is_valid_text(name)),
+                ("address", is_valid_text(address)),
+                ("mobile_no", is_valid_number(mobile_no, length=10)),
+                ("days", is_valid_number(days) and int(days) > 0),
+                ("room_type", choice is not None),
+                ("payment", pay_choice is not None),
+            ) if not ok]
+            if problems:
+                errors.append(f"row {line}: invalid {', '.join(problems)}")
+                continue
+            wanted.setdefault(choice, []).append((name, address, mobile_no, int(days), pay_choice))
+
+        # One pass over the room types, allocating each category's share
+        guests = []
+        for choice, group in wanted.items():
+            if len(group) > self.rooms.vacancy(choice):
+                errors.append(f"{ROOM_TYPES[choice]['name']}: {len(group)} guests, "
+                              f"{self.rooms.vacancy(choice)} rooms free")
+                continue
+            share = occupancy(self.rooms, choice)
+            for name, address, mobile_no, days, pay_choice in group:
+                arrival, departure = stay_dates(days)
+                room_no = allocate_stay(self.rooms, self.book, choice, arrival, departure)
+                if not room_no:
+                    errors.append(f"{name}: every free {ROOM_TYPES[choice]['name']} room "
+                                  f"is reserved during the stay")
+                    continue
+                guests.append(Booking(name, address, mobile_no, room_no,
+                                      calculate_price(choice, days, pay_choice, room_no,
+                                                      arrival, share),
+                                      days, arrival, departure, payment=pay_choice))
+
+        if errors:
+            for guest in guests:
+                self.rooms.release(guest.room_no)
+            raise ValueError("; ".join(errors))
+
+        try:
+            self.store.insert_many(guests)
+        except Exception:
+            # Nothing was saved; hand every allocated room back
+            for guest in guests:
+                self.rooms.release(guest.room_no)
+            raise
+        for guest in guests:
+            self.search.add(guest)
+            self.book.start_stay(guest)
+        return guests
+
+    @metrics.timed("check_out_batch")
+    def check_out_batch(self, room_numbers):
+        """Check out many rooms in one write; returns (guests, missing rooms)."""
+        guests = self.store.delete_many(room_numbers)
+        if not getattr(self.store, "remote", False):
+            history.archive(guests)
+        found = {room_of(g) for g in guests}
+        for g in guests:
+            self.rooms.release(room_of(g))
+            self.search.remove(g)
+            self.book.end_stay(g)
+        return guests, [r for r in room_numbers if r not in found]
+
+    # ----- Show List -----
+    @metrics.timed("guest_list")
+    def show_guest_list(self):
+        print("\n--- Guest List ---")
+        shown = 0
+        for g in self.store.scan():
+            if not shown:
+                print(f"{'Name':<20} {'Room No.':<10}")
+                print("-" * 30)
+            print(f"{g.name:<20} {room_of(g):<10}")
+            shown += 1
+        if not shown:
+            print("No guests currently checked in.")
+
+    # ----- Checkout -----
+    def check_out(self):
+        print("\n--- Guest Checkout ---")
+        room_no = int(input_number("Enter room number: "))
+        with metrics.timer("check_out"):
+            g = self.store.delete(room_no)
+            if g is None:
+                print("❌ No guest found in that room.")
+                return
+            if not getattr(self.store, "remote", False):
+                history.archive([g])
+            self.rooms.release(room_no)
+            self.search.remove(g)
+            self.book.end_stay(g)
+        print(f"✅ Guest {g.name} has checked out. Thank you for staying with us!")
+
+    # ----- Get Info -----
+    def get_info(self):
+        print("\n--- Get Guest Info ---")
+        room_no = int(input_number("Enter room number: "))
+        with metrics.timer("get_info"):
+            g = next(self.store.scan(room_no=room_no), None)
+        if g is None:
+            print("❌ No guest found in that room.")
+            return
+        print(f"\n✅ Guest Found in Room {room_no}")
+        print(f"   Name: {g.name}")
+        print(f"   Address: {g.address}")
+        print(f"   Mobile: {mobile_of(g)}")
+        print(f"   Total Bill: ₹{g.price}")
+
+    # ----- Search -----
+    def search_guest(self):
+        print("\n--- Search Guest ---")
+        print("1. By name (start of name)")
+        print("2. By mobile number")
+        mode = input_choice("Choose search mode (1/2): ", ["1", "2"])
+        if mode == "1":
+            name = input_text("Enter name or its beginning: ")
+            with metrics.timer("search"):
+                rooms = self.search.by_name(name)
+        else:
+            mobile_no = input_number("Enter mobile number (10 digits): ", length=10)
+            with metrics.timer("search"):
+                rooms = self.search.by_mobile(mobile_no)
+
+        if not rooms:
+            print("❌ No matching guest found.")
+            return
+        print(f"{'Room No.':<10} {'Name':<20} {'Mobile':<12}")
+        print("-" * 44)
+        for room_no in rooms:
+            g = self.store.get(room_no)
+            if g is not None:
+                print(f"{room_no:<10} {g.name:<20} {mobile_of(g):<12}")
+
+
+    # ----- Reservations -----
+    def reservations(self):
+        print("\n--- Reservations ---")
+        print("1. New reservation")
+        print("2. Check in a reservation")
+        print("3. Cancel a reservation")
+        print("4. Free rooms for dates")
+        print("5. Upcoming reservations")
+        actions = {
+            "1": self.reserve,
+            "2": self.check_in_reservation,
+            "3": self.cancel_reservation,
+            "4": self.show_availability,
+            "5": self.show_reservations,
+        }
+        actions[input_choice("Choose an option (1-5): ", list(actions))]()
+
+    def input_stay(self):
+        """Ask for room type, arrival date and nights."""
+        for k, v in ROOM_TYPES.items():
+            print(f"{k}. {v['name']} - ₹{v['rate']} per day")
+        choice = int(input_choice("Choose room type: ", [str(k) for k in ROOM_TYPES]))
+        arrival = input_date("Arrival date (YYYY-MM-DD): ")
+        days = int(input_number("Number of nights: "))
+        return (choice, *stay_dates(max(days, 1), arrival))
+
+    def reserve(self):
+        name = input_text("Enter guest name: ")
+        address = input_text("Enter guest address: ")
+        mobile_no = input_number("Enter mobile number (10 digits): ", length=10)
+        choice, arrival, departure = self.input_stay()
+        pay_choice = int(input_choice(f"Payment: 1. Cash  2. Card ({PRICING.card_discount:.0%} "
+                                      f"discount): ", ["1", "2"]))
+
+        with metrics.timer("reserve"):
+            room_no = self.book.find_room(ROOM_TYPES[choice]["rooms"], arrival, departure)
+            if room_no is None:
+                print("❌ No rooms of this type are free for those dates.")
+                return
+            days = (departure - arrival).days
+            reservation = Reservation(name, address, mobile_no, room_no, arrival, departure,
+                                      calculate_price(choice, days, pay_choice, room_no, arrival),
+                                      pay_choice)
+            self.book.reserve(reservation)
+        print(f"✅ Room {room_no} reserved for {name} from {arrival} to {departure}.")
+        print(f"Total Bill: ₹{reservation.price}")
+
+    def check_in_reservation(self):
+        room_no = int(input_number("Enter reserved room number: "))
+        reservation = self.book.arriving(room_no)
+        if reservation is None:
+            print("❌ No reservation for that room today.")
+            return
+        if room_no in self.store:
+            print("❌ The room is still occupied by another guest.")
+            return
+        with metrics.timer("check_in"):
+            self.book.claim(room_no, reservation.arrival)
+            self.rooms.take(room_no)
+            guest = Booking(reservation.name, reservation.address, reservation.mobile_no,
+                            room_no, reservation.price, reservation.days,
+                            reservation.arrival, reservation.departure,
+                            payment=reservation.payment)
+            self.store.insert(guest)
+            self.search.add(guest)
+        print(f"✅ {guest.name} checked in to reserved Room {room_no}.")
+
+    def cancel_reservation(self):
+        room_no = int(input_number("Enter reserved room number: "))
+        arrival = input_date("Arrival date (YYYY-MM-DD): ")
+        reservation = self.book.cancel(room_no, arrival)
+        if reservation is None:
+            print("❌ No such reservation.")
+            return
+        print(f"✅ Reservation of {reservation.name} cancelled.")
+
+    def show_availability(self):
+        choice, arrival, departure = self.input_stay()
+        free = self.book.free_rooms(ROOM_TYPES[choice]["rooms"], arrival, departure)
+        if not free:
+            print("❌ No rooms of this type are free for those dates.")
+            return
+        print(f"{len(free)} rooms free: {', '.join(map(str, free))}")
+
+    def show_reservations(self):
+        upcoming = self.book.upcoming()
+        if not upcoming:
+            print("No upcoming reservations.")
+            return
+        print(f"{'Arrival':<12} {'Departure':<12} {'Room':<6} {'Name':<20}")
+        print("-" * 52)
+        for r in upcoming:
+            print(f"{r.arrival!s:<12} {r.departure!s:<12} {r.room_no:<6} {r.name:<20}")
+
+
+# -----------------------------
+# Main Menu
+# -----------------------------
+def main():
+    system = HotelSystem()
+    actions = {
+        "1": system.check_in,
+        "2": system.show_guest_list,
+        "3": system.check_out,
+        "4": system.get_info,
+        "5": system.search_guest,
+        "6": system.reservations,
+    }
+    while True:
+        print("\n================ HOTEL MANAGEMENT SYSTEM ================")
+        print("1. Check-in Guest")
+        print("2. Show Guest List")
+        print("3. Check-out Guest")
+        print("4. Get Guest Info")
+        print("5. Search Guest (name / mobile)")
+        print("6. Reservations")
+        print("7. Exit")
+        choice = input_choice("Enter your choice (1-7): ", ["1", "2", "3", "4", "5", "6", "7"])
+        if choice == "7":
+            system.save_snapshot()
+            print("Thank you for using the Hotel Management System!")
+            break
+        actions[choice]()
+        system.save_snapshot(force=False)
+
+
+# -----------------------------
+# Run Program
+# -----------------------------
+if __name__ == "__main__":
+    main()
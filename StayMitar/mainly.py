@@ -1,105 +1,153 @@
-
-# -*- coding: utf-8 -*-
-"""
-Hotel Management System - Main Menu (Tkinter GUI)
-Refactored & Clean Version
-"""
-
-import subprocess
-import tkinter as tk
-from tkinter import ttk
-
-
-# -----------------------------
-# Utility Functions
-# -----------------------------
-def open_checkin():
-    subprocess.call(["python", "checkin_gui_and_program.py"])
-
-
-def open_guest_list():
-    subprocess.call(["python", "listgui.py"])
-
-
-def open_checkout():
-    subprocess.call(["python", "checkoutgui.py"])
-
-
-def open_get_info():
-    subprocess.call(["python", "getinfoui.py"])
-
-
-# -----------------------------
-# Main Menu Class
-# -----------------------------
-class HotelManagementApp:
-    """Main menu window for Hotel Management."""
-
-    def __init__(self, root):
-        self.root = root
-        self.root.title("Hotel Management System")
-        self.root.geometry("900x700")
-        self.root.configure(bg="#f2f2f2")
-
-        self.setup_ui()
-
-    def setup_ui(self):
-        """Setup the main menu UI components."""
-
-        # Title
-        tk.Label(
-            self.root,
-            text="🏨 WELCOME TO HOTEL MANAGEMENT SYSTEM 🏨",
-            font=("Segoe UI", 24, "bold"),
-            bg="#f2f2f2",
-            fg="black",
-            pady=20
-        ).pack()
-
-        # Frame for buttons
-        frame = tk.Frame(self.root, bg="#f2f2f2")
-        frame.pack(pady=40)
-
-        # Menu buttons
-        buttons = [
-            ("1. Check In", open_checkin),
-            ("2. Show Guest List", open_guest_list),
-            ("3. Check Out", open_checkout),
-            ("4. Get Info of Guest", open_get_info),
-            ("5. Exit", self.root.quit),
-        ]
-
-        for text, command in buttons:
-            b = tk.Button(
-                frame,
-                text=text,
-                command=command,
-                font=("Segoe UI", 16, "bold"),
-                bg="#4CAF50" if "Exit" not in text else "#f44336",
-                fg="white",
-                activebackground="#45a049",
-                activeforeground="white",
-                relief="raised",
-                bd=3,
-                width=30,
-                height=2
-            )
-            b.pack(pady=15)
-
-        # Footer
-        tk.Label(
-            self.root,
-            text="Developed with ❤️ using Python & Tkinter",
-            font=("Segoe UI", 10, "italic"),
-            bg="#f2f2f2",
-            fg="gray"
-        ).pack(side="bottom", pady=10)
-
-
-# -----------------------------
-# Run Program
-# -----------------------------
-if __name__ == "__main__":
-    root = tk.Tk()
-    app = HotelManagementApp(root)
-    root.mainloop()
+
+# -*- coding: utf-8 -*-
+"""
+Hotel Management System - Main Menu (Tkinter GUI)
+Refactored & Clean Version
+"""
+
+import tkinter as tk
+from tkinter import ttk
+
+import checkin_gui_and_program as checkin
+from analytics import AnalyticsApp
+from allocator import RoomAllocator
+from checkoutgui import CheckoutApp
+from getinfoui import GetInfoApp
+from inventory import ROOM_TYPES
+from listgui import GuestListApp
+from reservations import ReservationBook
+from searchindex import GuestIndex
+from storage import open_store
+from worker import BackgroundWorker
+
+
+# -----------------------------
+# Main Menu Class
+# -----------------------------
+class HotelManagementApp:
+    """Main menu window for Hotel Management."""
+
+    def __init__(self, root):
+        self.root = root
+        self.root.title("Hotel Management System")
+        self.root.geometry("900x700")
+        self.root.configure(bg="#f2f2f2")
+
+        # One store and allocator shared by every window, loaded in the background
+        self.store = None
+        self.rooms = None
+        self.search = None
+        self.book = None
+        self.menu_buttons = []
+        self.worker = BackgroundWorker(self.root)
+
+        self.setup_ui()
+        self.worker.submit(self.load_store, on_done=self.store_ready)
+
+    def load_store(self):
+        """Open the booking store (runs on the worker thread)."""
+        store = open_store()
+        if getattr(store, "remote", False):
+            return (store, *store.proxies(), len(store))
+        rooms = RoomAllocator(ROOM_TYPES, store.rooms())
+        return store, rooms, GuestIndex(store), ReservationBook(store), len(store)
+
+    def store_ready(self, result):
+        """Enable the menu once bookings are loaded."""
+        self.store, self.rooms, self.search, self.book, guests = result
+        self.status.configure(text=f"{guests} guests checked in")
+        for b in self.menu_buttons:
+            b.configure(state="normal")
+
+    # -----------------------------
+    # Windows (opened in-process as Toplevels)
+    # -----------------------------
+    def open_checkin(self):
+        checkin.HotelManagementApp(self.root, self.store, self.rooms, self.search, self.book)
+
+    def open_guest_list(self):
+        GuestListApp(self.root, self.store, self.rooms, self.search, self.book)
+
+    def open_checkout(self):
+        CheckoutApp(self.root, self.store, self.rooms, self.search, self.book)
+
+    def open_get_info(self):
+        GetInfoApp(self.root, self.store, self.search, self.rooms, self.book)
+
+    def open_analytics(self):
+        AnalyticsApp(self.root, self.store)
+
+    def setup_ui(self):
+        """Setup the main menu UI components."""
+
+        # Title
+        tk.Label(
+            self.root,
+            text="🏨 WELCOME TO HOTEL MANAGEMENT SYSTEM 🏨",
+            font=("Segoe UI", 24, "bold"),
+            bg="#f2f2f2",
+            fg="black",
+            pady=20
+        ).pack()
+
+        # Frame for buttons
+        frame = tk.Frame(self.root, bg="#f2f2f2")
+        frame.pack(pady=40)
+
+        # Menu buttons
+        buttons = [
+            ("1. Check In", self.open_checkin),
+            ("2. Show Guest List", self.open_guest_list),
+            ("3. Check Out", self.open_checkout),
+            ("4. Get Info of Guest", self.open_get_info),
+            ("5. Analytics", self.open_analytics),
+            ("6. Exit", self.root.quit),
+        ]
+
+        for text, command in buttons:
+            b = tk.Button(
+                frame,
+                text=text,
+                command=command,
+                font=("Segoe UI", 16, "bold"),
+                bg="#4CAF50" if "Exit" not in text else "#f44336",
+                fg="white",
+                activebackground="#45a049",
+                activeforeground="white",
+                relief="raised",
+                bd=3,
+                width=30,
+                height=2
+            )
+            b.pack(pady=15)
+            if "Exit" not in text:
+                b.configure(state="disabled")
+                self.menu_buttons.append(b)
+
+        # Loading / status line
+        self.status = tk.Label(
+            self.root,
+            text="Loading bookings...",
+            font=("Segoe UI", 11),
+            bg="#f2f2f2",
+            fg="gray"
+        )
+        self.status.pack()
+
+        # Footer
+        tk.Label(
+            self.root,
+            text="Developed with ❤️ using Python & Tkinter",
+            font=("Segoe UI", 10, "italic"),
+            bg="#f2f2f2",
+            fg="gray"
+        ).pack(side="bottom", pady=10)
+
+
+# -----------------------------
+# Run Program
+# -----------------------------
+if __name__ == "__main__":
+    root = tk.Tk()
+    app = HotelManagementApp(root)
+    root.mainloop()
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Hotel Management - Operation Metrics
+Counts, latency histograms and I/O per operation, exported as JSON or
+Prometheus text
+
+Enable with STAYMITAR_METRICS=<file> (a .prom suffix selects Prometheus
+text, anything else JSON). The file is written on exit and, with
+STAYMITAR_METRICS_INTERVAL=<seconds>, periodically. When the variable
+is unset `timed` returns functions unwrapped and `timer` is a shared
+no-op, so the hooks cost nothing.
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+OUTPUT = os.environ.get("STAYMITAR_METRICS", "")
+INTERVAL = float(os.environ.get("STAYMITAR_METRICS_INTERVAL", "0") or 0)
+ENABLED = bool(OUTPUT)
+
+# Latency histogram bucket bounds in seconds (+Inf is implicit)
+BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+_stats = {}
+_lock = threading.Lock()
+_local = threading.local()
+
+
+# -----------------------------
+# Recording
+# -----------------------------
+def _op(name):
+    op = _stats.get(name)
+    if op is None:
+        op = _stats[name] = {
+            "count": 0,
+            "errors": 0,
+            "seconds_total": 0.0,
+            "buckets": [0] * (len(BUCKETS) + 1),
+            "bytes_read": 0,
+            "bytes_written": 0,
+            "records_decoded": 0,
+        }
+    return op
+
+
+def _observe(name, seconds, failed):
+    with _lock:
+        op = _op(name)
+        op["count"] += 1
+        op["errors"] += failed
+        op["seconds_total"] += seconds
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                op["buckets"][i] += 1
+                break
+        else:
+            op["buckets"][-1] += 1
+
+
+def add(bytes_read=0, bytes_written=0, records_decoded=0):
+    """Charge I/O to the innermost operation running on this thread.
+
+    Call sites guard with `if metrics.ENABLED:` to stay free when off.
+    """
+    stack = getattr(_local, "ops", None)
+    if not stack:
+        return
+    with _lock:
+        op = _op(stack[-1])
+        op["bytes_read"] += bytes_read
+        op["bytes_written"] += bytes_written
+        op["records_decoded"] += records_decoded
+
+
+@contextmanager
+def _timer(name):
+    stack = _local.__dict__.setdefault("ops", [])
+    stack.append(name)
+    start = time.perf_counter()
+    failed = False
+    try:
+        yield
+    except BaseException:
+        failed = True
+        raise
+    finally:
+        stack.pop()
+        _observe(name, time.perf_counter() - start, failed)
+
+
+@contextmanager
+def _null_timer():
+    yield
+
+
+def timer(name):
+    """Context manager timing one operation (a no-op when disabled)."""
+    return _timer(name) if ENABLED else _null_timer()
+
+
+def timed(name):
+    """Decorator timing every call of a function as operation `name`."""
+    def decorate(fn):
+        if not ENABLED:
+            return fn
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with _timer(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+# -----------------------------
+# Export
+# -----------------------------
+def snapshot():
+    """Copy of the current statistics with cumulative histogram buckets."""
+    with _lock:
+        ops = {}
+        for name, op in sorted(_stats.items()):
+            cumulative, total = {}, 0
+            for bound, n in zip(BUCKETS + ("+Inf",), op["buckets"]):
+                total += n
+                cumulative[str(bound)] = total
+            ops[name] = dict(op, buckets=cumulative)
+    return {"timestamp": time.time(), "ops": ops}
+
+
+def to_prometheus(data):
+    """Render a snapshot in the Prometheus text exposition format."""
+    lines = ["# TYPE staymitar_op_seconds histogram"]
+    for name, op in data["ops"].items():
+        for bound, n in op["buckets"].items():
+            lines.append(f'staymitar_op_seconds_bucket{{op="{name}",le="{bound}"}} {n}')
+        lines.append(f'staymitar_op_seconds_sum{{op="{name}"}} {op["seconds_total"]}')
+        lines.append(f'staymitar_op_seconds_count{{op="{name}"}} {op["count"]}')
+    for field in ("errors", "bytes_read", "bytes_written", "records_decoded"):
+        lines.append(f"# TYPE staymitar_op_{field}_total counter")
+        for name, op in data["ops"].items():
+            lines.append(f'staymitar_op_{field}_total{{op="{name}"}} {op[field]}')
+    return "\n".join(lines) + "\n"
+
+
+def dump(path=None):
+    """Write the metrics file atomically."""
+    path = path or OUTPUT
+    data = snapshot()
+    text = to_prometheus(data) if path.endswith(".prom") else json.dumps(data, indent=2)
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+def _dump_periodically():
+    while True:
+        time.sleep(INTERVAL)
+        dump()
+
+
+if ENABLED:
+    atexit.register(dump)
+    if INTERVAL > 0:
+        threading.Thread(target=_dump_periodically, name="metrics", daemon=True).start()
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Hotel Management - Legacy Record Migrator
+Normalizes every pickled booking variant into one schema, streaming
+
+Usage:
+    python migrate.py SRC DST [--workers N]
+
+Records from the old `__main__.save` class, the console `Guest`
+(room / mobile_no) and the GUI `Booking` (room_no / mobile) are all
+rewritten with the same fields. Tombstones are kept in order, so a
+journaled file migrates to an equivalent journal. Blank and corrupt
+records are skipped and reported.
+"""
+
+import codecs
+import os
+import pickle
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime
+
+from booking import Booking
+from storage import READ_BLOCK, Record, Tombstone, mobile_of, next_pickle, replace_file, room_of
+
+# Classes the legacy files are known to reference; anything else is refused
+LEGACY_MODULES = {"__main__", "main", "checkin_gui_and_program", "checkoutgui",
+                  "getinfoui", "listgui"}
+SAFE_GLOBALS = {
+    ("booking", "Booking"): Booking,
+    ("storage", "Record"): Record,
+    ("storage", "Tombstone"): Tombstone,
+    ("datetime", "date"): date,
+    ("datetime", "datetime"): datetime,
+    # Protocol 2 pickles the bytes inside a date as _codecs.encode(text, "latin1")
+    ("_codecs", "encode"): codecs.encode,
+}
+
+
+class _Legacy:
+    """Attribute bag for a legacy booking; `source` names its original class."""
+
+    source = None
+
+
+_legacy_classes = {}
+
+
+def _legacy_class(module, name):
+    """A _Legacy subclass standing in for module.name (one per name)."""
+    cls = _legacy_classes.get((module, name))
+    if cls is None:
+        cls = _legacy_classes[(module, name)] = type(name, (_Legacy,), {"source": f"{module}.{name}"})
+    return cls
+
+
+class _MigrationUnpickler(pickle.Unpickler):
+    """Unpickler that only builds known booking classes and plain data."""
+
+    def find_class(self, module, name):
+        if (module, name) in SAFE_GLOBALS:
+            return SAFE_GLOBALS[(module, name)]
+        if module in LEGACY_MODULES:
+            return _legacy_class(module, name)
+        raise pickle.UnpicklingError(f"refusing to load {module}.{name}")
+
+
+# -----------------------------
+# Normalization
+# -----------------------------
+def normalize(raw):
+    """(Booking, None) in the shared schema, or (None, problem) if unusable."""
+    if isinstance(raw, Tombstone):
+        return raw, None
+    if not isinstance(raw, (_Legacy, Record, Booking)):
+        return None, f"not a booking ({type(raw).__name__})"
+
+    record = Booking(
+        str(getattr(raw, "name", "") or "").strip(),
+        str(getattr(raw, "address", "") or "").strip(),
+        mobile_of(raw).strip(),
+        room_of(raw),
+        getattr(raw, "price", 0) or 0,
+        getattr(raw, "days", 0) or 0,
+        *(getattr(raw, field, None) for field in ("arrival", "departure", "checked_out")),
+        payment=getattr(raw, "payment", None),
+    )
+
+    if not record.name:
+        return None, f"blank name (room {record.room_no})"
+    try:
+        record.room_no = int(record.room_no)
+        record.price = float(record.price)
+        record.days = int(record.days)
+    except (TypeError, ValueError):
+        return None, f"bad room/price/days for {record.name!r}"
+    return record, None
+
+
+def source_of(raw):
+    return getattr(raw, "source", None) or f"{type(raw).__module__}.{type(raw).__name__}"
+
+
+# -----------------------------
+# Streaming
+# -----------------------------
+def read_entries(path, start=0, end=None):
+    """Yield (offset, next_offset, entry, problem) for the pickles in [start, end).
+
+    A corrupt entry is reported and reading resumes at the next pickle
+    header; a truncated last entry ends the stream.
+    """
+    end = os.path.getsize(path) if end is None else end
+    with open(path, "rb") as f:
+        f.seek(start)
+        unpickler = _MigrationUnpickler(f)
+        while f.tell() < end:
+            offset = f.tell()
+            try:
+                entry = unpickler.load()
+            except EOFError:
+                yield offset, end, None, "truncated record"
+                return
+            except Exception as e:
+                resume = next_pickle(f, offset + 1, end)
+                yield offset, end if resume is None else resume, None, f"corrupt record ({e})"
+                if resume is None:
+                    return
+                f.seek(resume)
+                unpickler = _MigrationUnpickler(f)
+                continue
+            yield offset, f.tell(), entry, None
+
+
+def migrate_range(src, dst, start=0, end=None):
+    """Migrate one byte range of src into dst; returns a stats dict.
+
+    Output is buffered and written in blocks, so memory stays bounded
+    whatever the file size. `stop` is where reading ended, which lets
+    the caller check that a chunk boundary fell between records.
+    """
+    stats = {"records": 0, "tombstones": 0, "sources": Counter(), "problems": [], "stop": start}
+    buffer, size = [], 0
+    with open(dst, "wb") as out:
+        for offset, stop, raw, problem in read_entries(src, start, end):
+            stats["stop"] = stop
+            if problem is None:
+                stats["sources"][source_of(raw)] += 1
+                entry, problem = normalize(raw)
+            if problem is not None:
+                stats["problems"].append((offset, problem))
+                continue
+            stats["tombstones" if isinstance(entry, Tombstone) else "records"] += 1
+            data = pickle.dumps(entry, protocol=2)
+            buffer.append(data)
+            size += len(data)
+            if size >= READ_BLOCK:
+                out.write(b"".join(buffer))
+                buffer, size = [], 0
+        out.write(b"".join(buffer))
+    return stats
+
+
+# -----------------------------
+# Chunking
+# -----------------------------
+def chunk_bounds(path, chunks):
+    """Split a file into up to `chunks` byte ranges starting at pickle headers."""
+    size = os.path.getsize(path)
+    bounds = [0]
+    with open(path, "rb") as f:
+        for i in range(1, chunks):
+            target = max(size * i // chunks, bounds[-1] + 1)
+            start = next_pickle(f, target, size)
+            if start is None:
+                break
+            if start > bounds[-1]:
+                bounds.append(start)
+    bounds.append(size)
+    return list(zip(bounds, bounds[1:]))
+
+
+def _merge(total, stats):
+    total["records"] += stats["records"]
+    total["tombstones"] += stats["tombstones"]
+    total["sources"].update(stats["sources"])
+    total["problems"] += stats["problems"]
+
+
+def _copy_parts(parts):
+    for part in parts:
+        with open(part, "rb") as f:
+            while True:
+                block = f.read(READ_BLOCK)
+                if not block:
+                    break
+                yield block
+
+
+def migrate(src, dst, workers=1):
+    """Migrate src into dst, splitting it across a process pool if workers > 1.
+
+    A chunk boundary is only a guess at a record start; if a worker's
+    last record runs past its boundary, the file is redone serially.
+    """
+    ranges = chunk_bounds(src, workers) if workers > 1 else [(0, os.path.getsize(src))]
+    parts = [f"{dst}.part{i}" for i in range(len(ranges))]
+    try:
+        if len(ranges) > 1:
+            with ProcessPoolExecutor(workers) as pool:
+                results = list(pool.map(migrate_range, [src] * len(ranges), parts,
+                                        *zip(*ranges)))
+            if any(r["stop"] != end for r, (_, end) in zip(results, ranges)):
+                return migrate(src, dst, workers=1)
+        else:
+            results = [migrate_range(src, parts[0])]
+
+        total = {"records": 0, "tombstones": 0, "sources": Counter(), "problems": []}
+        for stats in results:
+            _merge(total, stats)
+        replace_file(dst, _copy_parts(parts))
+        return total
+    finally:
+        for part in parts:
+            if os.path.exists(part):
+                os.remove(part)
+
+
+# -----------------------------
+# Run Program
+# -----------------------------
+def main(argv):
+    if len(argv) < 2:
+        print(__doc__.split("Usage:")[1])
+        return 1
+    workers = int(argv[argv.index("--workers") + 1]) if "--workers" in argv else 1
+    report = migrate(argv[0], argv[1], workers)
+
+    print(f"✅ Migrated {report['records']} records and {report['tombstones']} "
+          f"checkouts into {argv[1]}")
+    for source, count in report["sources"].most_common():
+        print(f"   {source:<40} {count}")
+    if report["problems"]:
+        print(f"❌ Skipped {len(report['problems'])} entries:")
+        for offset, problem in report["problems"]:
+            print(f"   byte {offset}: {problem}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Hotel Management - Pricing
+Nightly rate tables per room category and memoized stay quotes
+
+Rules live under "pricing" in inventory.json, all optional:
+
+    "pricing": {
+        "weekdays": {"fri": 1.2, "sat": 1.2},
+        "seasons": [{"name": "Peak", "from": "12-20", "to": "01-05",
+                     "multiplier": 1.5, "categories": [1, 2]}],
+        "occupancy": [{"above": 0.8, "surcharge": 0.10}],
+        "long_stay": [{"nights": 7, "discount": 0.05}],
+        "card_discount": 0.10
+    }
+
+Weekday and season multipliers are compiled into one nightly rate per
+category and date, kept as running totals, so a stay of any length is
+priced with one subtraction. The occupancy surcharge (share of the
+category's rooms taken), long-stay discount and card discount then
+apply to the whole stay.
+"""
+
+import sys
+from bisect import bisect_right
+from datetime import date, timedelta
+from functools import lru_cache
+from itertools import accumulate
+
+from inventory import INVENTORY
+
+WEEKDAYS = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+
+# Nights covered by a rate table; quotes outside it rebuild the table
+HORIZON_DAYS = 400
+
+# Distinct (category, arrival, nights, payment, ...) quotes remembered
+QUOTE_CACHE = 4096
+
+CARD_DISCOUNT = 0.10
+
+
+# -----------------------------
+# Rule Helpers
+# -----------------------------
+def _month_day(text):
+    month, day = text.split("-")
+    return int(month), int(day)
+
+
+def _in_season(night, season):
+    """Whether a night falls in a season; "from" after "to" wraps the new year."""
+    start, end = _month_day(season["from"]), _month_day(season["to"])
+    today = (night.month, night.day)
+    if start <= end:
+        return start <= today <= end
+    return today >= start or today <= end
+
+
+def _step(thresholds, value, key, field):
+    """Field of the last threshold entry whose key value <= value (0 if none)."""
+    entries = sorted(thresholds, key=lambda entry: entry[key])
+    i = bisect_right([entry[key] for entry in entries], value) - 1
+    return entries[i][field] if i >= 0 else 0
+
+
+# -----------------------------
+# Pricing Engine
+# -----------------------------
+class PricingEngine:
+    """Quotes stays from per-category nightly rate tables."""
+
+    def __init__(self, inventory=INVENTORY, start=None, horizon=HORIZON_DAYS):
+        self.inventory = inventory
+        self.rules = inventory.pricing
+        self.weekdays = [float(self.rules.get("weekdays", {}).get(day, 1)) for day in WEEKDAYS]
+        self.seasons = self.rules.get("seasons", [])
+        self.card_discount = float(self.rules.get("card_discount", CARD_DISCOUNT))
+        self._quote = lru_cache(maxsize=QUOTE_CACHE)(self._price)
+        self.build(start or date.today(), horizon)
+
+    def build(self, start, horizon=HORIZON_DAYS):
+        """Compile the rules into running nightly totals from `start`."""
+        self.start = start
+        self.horizon = horizon
+        nights = [start + timedelta(days=i) for i in range(horizon)]
+        self.totals = {}
+        for category, info in self.inventory.categories.items():
+            rates = []
+            for night in nights:
+                rate = info["rate"] * self.weekdays[night.weekday()]
+                for season in self.seasons:
+                    if category in season.get("categories", [category]) and _in_season(night, season):
+                        rate *= season["multiplier"]
+                rates.append(rate)
+            self.totals[category] = list(accumulate(rates, initial=0.0))
+        self._quote.cache_clear()
+
+    def nightly(self, category, night):
+        """Rate of one category for one night, before stay-level adjustments."""
+        i = self._offset(night, 1)
+        totals = self.totals[category]
+        return totals[i + 1] - totals[i]
+
+    def _offset(self, arrival, nights):
+        """Table index of arrival, rebuilding the table if the stay falls outside it."""
+        offset = (arrival - self.start).days
+        if offset < 0 or offset + nights > self.horizon:
+            start = min(arrival, date.today())
+            offset = (arrival - start).days
+            self.build(start, max(HORIZON_DAYS, offset + nights))
+        return offset
+
+    def surcharge(self, occupancy):
+        """Occupancy surcharge for a category that is `occupancy` (0-1) full."""
+        return _step(self.rules.get("occupancy", []), occupancy, "above", "surcharge")
+
+    def _price(self, category, offset, nights, payment, surcharge, floor):
+        totals = self.totals[category]
+        price = totals[offset + nights] - totals[offset] + floor * nights
+        price *= 1 + surcharge
+        price *= 1 - _step(self.rules.get("long_stay", []), nights, "nights", "discount")
+        if payment == 2:
+            price *= 1 - self.card_discount
+        return round(price, 2)
+
+    def quote(self, category, nights, payment=1, arrival=None, occupancy=0.0, room=None):
+        """Price of a stay; with a room its floor surcharge is added per night."""
+        floor = (self.inventory.floor_of(room) or {}).get("surcharge", 0) if room else 0
+        offset = self._offset(arrival or date.today(), nights)
+        return self._quote(category, offset, nights, payment, self.surcharge(occupancy), floor)
+
+    def quotes(self, nights, payment=1, arrival=None, rooms=None):
+        """{category: price} for every category; with an allocator each
+        category is quoted at its current occupancy."""
+        return {
+            category: self.quote(category, nights, payment, arrival,
+                                 occupancy(rooms, category) if rooms is not None else 0.0)
+            for category in self.inventory.categories
+        }
+
+
+def occupancy(rooms, category):
+    """Share (0-1) of a category's rooms the allocator has handed out."""
+    size = len(INVENTORY.categories[category]["rooms"])
+    return 1 - rooms.vacancy(category) / size if size else 1.0
+
+
+PRICING = PricingEngine()
+
+
+# -----------------------------
+# Run Program
+# -----------------------------
+if __name__ == "__main__":
+    nights = int(sys.argv[1]) if len(sys.argv) > 1 else 1
+    arrival = date.fromisoformat(sys.argv[2]) if len(sys.argv) > 2 else date.today()
+    print(f"{nights} night(s) from {arrival}:")
+    for category, price in PRICING.quotes(nights, 1, arrival).items():
+        card = PRICING.quote(category, nights, 2, arrival)
+        print(f"  {INVENTORY.categories[category]['name']:<12} ₹{price:>10,.2f}  (card ₹{card:,.2f})")
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Hotel Management - Reservations
+Date-ranged stays with a per-room sorted-interval index
+"""
+
+import pickle
+import sys
+from bisect import bisect_right
+from datetime import date, timedelta
+
+from storage import iter_records, log_for, replace_file, room_of
+
+RESERVATIONS_FILE = "reservations.dat"
+
+
+# -----------------------------
+# Data Model
+# -----------------------------
+class Reservation:
+    """An advance booking of one room from arrival up to (not including) departure."""
+
+    payment = None  # reservations saved before payment was recorded
+
+    def __init__(self, name, address, mobile_no, room_no, arrival, departure, price=0,
+                 payment=None):
+        self.name = name
+        self.address = address
+        self.mobile_no = mobile_no
+        self.room_no = room_no
+        self.arrival = arrival
+        self.departure = departure
+        self.price = price
+        self.payment = payment
+
+    @property
+    def days(self):
+        return (self.departure - self.arrival).days
+
+
+def stay_dates(days, arrival=None):
+    """(arrival, departure) for a stay of `days` nights starting today by default."""
+    arrival = arrival or date.today()
+    return arrival, arrival + timedelta(days=days)
+
+
+# -----------------------------
+# Interval Index
+# -----------------------------
+class StayIndex:
+    """Per-room sorted, non-overlapping [arrival, departure) intervals.
+
+    Because a room's stays never overlap, sorting by arrival also sorts
+    by departure, so one bisect finds the only two stays that could
+    clash with a new one: O(log k) per room with k stays.
+    """
+
+    def __init__(self):
+        self.arrivals = {}
+        self.departures = {}
+
+    def is_free(self, room, arrival, departure):
+        """True if no stay in `room` overlaps [arrival, departure)."""
+        arrivals = self.arrivals.get(room)
+        if not arrivals:
+            return True
+        i = bisect_right(arrivals, arrival)
+        if i and self.departures[room][i - 1] > arrival:
+            return False
+        return i == len(arrivals) or arrivals[i] >= departure
+
+    def add(self, room, arrival, departure):
+        """Record a stay; ValueError if it overlaps an existing one."""
+        if departure <= arrival:
+            raise ValueError("Departure must be after arrival.")
+        if not self.is_free(room, arrival, departure):
+            raise ValueError(f"Room {room} is already booked for those dates.")
+        arrivals = self.arrivals.setdefault(room, [])
+        i = bisect_right(arrivals, arrival)
+        arrivals.insert(i, arrival)
+        self.departures.setdefault(room, []).insert(i, departure)
+
+    def remove(self, room, arrival):
+        """Drop the stay in `room` starting on `arrival`, if any."""
+        arrivals = self.arrivals.get(room, [])
+        i = bisect_right(arrivals, arrival) - 1
+        if i >= 0 and arrivals[i] == arrival:
+            del arrivals[i]
+            del self.departures[room][i]
+
+    def free_rooms(self, rooms, arrival, departure, busy=()):
+        """Rooms (in order) free over the whole date range, skipping `busy` ones."""
+        for room in rooms:
+            if room not in busy and self.is_free(room, arrival, departure):
+                yield room
+
+
+# -----------------------------
+# Reservation Book
+# -----------------------------
+class ReservationBook:
+    """Advance bookings in reservations.dat plus the interval index.
+
+    The index also holds the dated stays of guests already checked in;
+    older records without dates are kept in `undated` and treated as
+    occupied for every future date. Reservations two desks saved for the
+    same room and dates are reported on load and kept aside in `clashing`.
+    """
+
+    def __init__(self, store=None, path=RESERVATIONS_FILE):
+        self.path = path
+        self.index = StayIndex()
+        self.pending = {}
+        self.undated = set()
+        self.clashing = []
+        for reservation in iter_records(path):
+            try:
+                self.index.add(reservation.room_no, reservation.arrival, reservation.departure)
+            except ValueError as e:
+                print(f"⚠️ {path}: skipped the reservation for {reservation.name!r} "
+                      f"from {reservation.arrival}: {e}", file=sys.stderr)
+                self.clashing.append(reservation)
+                continue
+            self.pending[(reservation.room_no, reservation.arrival)] = reservation
+        if store is not None:
+            for record in store.scan():
+                self.start_stay(record)
+
+    def _save(self):
+        log = log_for(self.path)
+        log.discard()
+        # Clashing reservations stay in the file until someone sorts them out
+        replace_file(self.path, (pickle.dumps(r, protocol=2)
+                                 for r in [*self.pending.values(), *self.clashing]),
+                     log.durability)
+
+    # ----- Advance Bookings -----
+    def free_rooms(self, rooms, arrival, departure):
+        """Rooms of a category's `rooms` free over the whole date range."""
+        return list(self.index.free_rooms(rooms, arrival, departure, self.undated))
+
+    def find_room(self, rooms, arrival, departure):
+        """Lowest room of a category's `rooms` free over the date range, or None."""
+        return next(self.index.free_rooms(rooms, arrival, departure, self.undated), None)
+
+    def reserve(self, reservation):
+        """Book a room ahead; ValueError if it is taken for those dates."""
+        self.index.add(reservation.room_no, reservation.arrival, reservation.departure)
+        self.pending[(reservation.room_no, reservation.arrival)] = reservation
+        log_for(self.path).append(pickle.dumps(reservation, protocol=2))
+
+    def cancel(self, room, arrival):
+        """Remove a reservation and free its dates; returns it or None."""
+        reservation = self.pending.pop((room, arrival), None)
+        if reservation is not None:
+            self.index.remove(room, arrival)
+            self._save()
+        return reservation
+
+    def claim(self, room, arrival):
+        """Take a reservation out of the book at check-in, keeping its dates
+        blocked for the guest it becomes; returns it or None."""
+        reservation = self.pending.pop((room, arrival), None)
+        if reservation is not None:
+            self._save()
+        return reservation
+
+    def arriving(self, room, on=None):
+        """The reservation for `room` whose dates cover `on` (today), or None."""
+        on = on or date.today()
+        arrivals = self.index.arrivals.get(room, [])
+        i = bisect_right(arrivals, on) - 1
+        if i < 0 or self.index.departures[room][i] <= on:
+            return None
+        # The stay covering `on` may be a checked-in guest's, not a reservation
+        return self.pending.get((room, arrivals[i]))
+
+    def upcoming(self):
+        """Pending reservations in arrival order."""
+        return sorted(self.pending.values(), key=lambda r: (r.arrival, r.room_no))
+
+    # ----- Checked-in Stays -----
+    def start_stay(self, record):
+        """Index a checked-in guest's dates (or mark the room undated).
+
+        Dates already blocked, e.g. by the reservation the guest claimed,
+        are left as they are.
+        """
+        arrival = getattr(record, "arrival", None)
+        departure = getattr(record, "departure", None)
+        room = room_of(record)
+        if arrival is None or departure is None:
+            self.undated.add(room)
+        elif self.index.is_free(room, arrival, departure):
+            self.index.add(room, arrival, departure)
+
+    def end_stay(self, record):
+        """Free a checked-out guest's remaining dates."""
+        room = room_of(record)
+        self.undated.discard(room)
+        arrival = getattr(record, "arrival", None)
+        if arrival is not None:
+            self.index.remove(room, arrival)
+
+
+def allocate_stay(rooms, book, category, arrival, departure):
+    """Lowest room of `category` that is free now and has no reservation
+    during the stay. Rooms the allocator offers that clash with a
+    reservation are handed back afterwards."""
+    if hasattr(rooms, "allocate_stay"):
+        # The booking service checks its own reservations in one request
+        return rooms.allocate_stay(category, arrival, departure)
+    clashing = []
+    room = rooms.allocate(category)
+    while room and not book.index.is_free(room, arrival, departure):
+        clashing.append(room)
+        room = rooms.allocate(category)
+    for other in clashing:
+        rooms.release(other)
+    return room
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Hotel Management - Guest Search Index
+Name-prefix and mobile-number lookups over the checked-in guests
+"""
+
+from bisect import bisect_left, insort
+
+from storage import mobile_of, room_of
+
+
+# -----------------------------
+# Guest Index
+# -----------------------------
+class GuestIndex:
+    """Sorted (NAME, room) list for prefix search plus a mobile -> rooms hash."""
+
+    def __init__(self, store=None):
+        self.names = []
+        self.mobiles = {}
+        if store is not None:
+            # One sort for the whole store; add() keeps it sorted afterwards
+            for record in store.scan():
+                room = room_of(record)
+                self.names.append((str(record.name).upper(), room))
+                self.mobiles.setdefault(mobile_of(record), set()).add(room)
+            self.names.sort()
+
+    # ----- Maintenance -----
+    def add(self, record):
+        """Index a guest on check-in."""
+        room = room_of(record)
+        insort(self.names, (str(record.name).upper(), room))
+        self.mobiles.setdefault(mobile_of(record), set()).add(room)
+
+    def remove(self, record):
+        """Drop a guest on checkout."""
+        room = room_of(record)
+        key = (str(record.name).upper(), room)
+        i = bisect_left(self.names, key)
+        if i < len(self.names) and self.names[i] == key:
+            del self.names[i]
+
+        mobile = mobile_of(record)
+        rooms = self.mobiles.get(mobile)
+        if rooms is not None:
+            rooms.discard(room)
+            if not rooms:
+                del self.mobiles[mobile]
+
+    # ----- Lookup -----
+    def by_name(self, prefix, limit=None):
+        """Rooms of guests whose name starts with prefix (case-insensitive)."""
+        prefix = prefix.strip().upper()
+        rooms = []
+        i = bisect_left(self.names, (prefix,))
+        while i < len(self.names) and self.names[i][0].startswith(prefix):
+            rooms.append(self.names[i][1])
+            if limit is not None and len(rooms) >= limit:
+                break
+            i += 1
+        return rooms
+
+    def by_mobile(self, mobile):
+        """Rooms booked under an exact mobile number."""
+        return sorted(self.mobiles.get(mobile.strip(), ()))
+
+    def __len__(self):
+        return len(self.names)
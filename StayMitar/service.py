@@ -0,0 +1,446 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Hotel Management - Booking Service
+One process owns the store, allocator and indexes; terminals talk to it
+
+Usage:
+    python service.py [--format pickle|fixed|sqlite] [--address HOST:PORT|unix:PATH]
+
+Clients opt in with STAYMITAR_FORMAT=service (and STAYMITAR_SERVICE if
+the daemon is not on the default address). open_store() then returns a
+RemoteStore, and the console and GUI use its allocator, search and
+reservation proxies, so every check-in from every desk goes through
+the one allocator.
+
+Requests are JSON lines answered in order on an asyncio event loop.
+Reads come straight from the daemon's memory; writes run inline, one
+at a time, so two desks can never be handed the same room.
+"""
+
+import asyncio
+import json
+import os
+import socket
+import sys
+import threading
+from datetime import date
+
+import metrics
+from allocator import as_ranges
+from booking import FIELDS, Booking
+from inventory import RoomRanges
+from storage import mobile_of, room_of
+
+SERVICE = os.environ.get("STAYMITAR_SERVICE", "127.0.0.1:7411")
+
+DATE_FIELDS = ("arrival", "departure", "checked_out")
+RESERVATION_FIELDS = ("name", "address", "mobile_no", "room_no", "arrival", "departure", "price",
+                      "payment")
+
+
+# -----------------------------
+# Wire Format
+# -----------------------------
+def to_wire(record, fields=FIELDS):
+    """JSON-ready dict of a booking (or reservation), dates as ISO strings."""
+    if record is None:
+        return None
+    data = {field: getattr(record, field, None) for field in fields}
+    data["room_no"] = room_of(record)
+    data["mobile_no"] = mobile_of(record)
+    for field in DATE_FIELDS:
+        if data.get(field):
+            data[field] = data[field].isoformat()
+    return data
+
+
+def _dates(data):
+    return {k: date.fromisoformat(v) if k in DATE_FIELDS and v else v for k, v in data.items()}
+
+
+def from_wire(data):
+    """Booking from a to_wire dict."""
+    return None if data is None else Booking(**_dates(data))
+
+
+def reservation_from_wire(data):
+    from reservations import Reservation
+    return None if data is None else Reservation(**_dates(data))
+
+
+def parse_address(address):
+    """(family, address) for "host:port" or "unix:/path"."""
+    if address.startswith("unix:"):
+        return socket.AF_UNIX, address[5:]
+    host, _, port = address.rpartition(":")
+    return socket.AF_INET, (host or "127.0.0.1", int(port))
+
+
+# -----------------------------
+# Server
+# -----------------------------
+class BookingService:
+    """Dispatches requests against one HotelSystem held in memory.
+
+    Rooms handed out by allocate are `held` until the booking is
+    inserted, so a client's release only returns rooms it never booked
+    and can't free a room another desk has since taken. Each connection
+    also keeps its own set, and the rooms still in it when the client
+    disconnects are released.
+    """
+
+    # Operations that are given the connection's held set
+    HOLDING = ("insert_many", "allocate", "allocate_stay", "release")
+
+    def __init__(self, hotel):
+        self.hotel = hotel
+        self.held = set()
+        self.ops = {
+            "ping": lambda: "pong",
+            # Store
+            "get": lambda room_no: to_wire(self.hotel.store.get(room_no)),
+            "scan": self.scan,
+            "page": lambda offset, limit, sort="room", reverse=False: [
+                to_wire(r) for r in self.hotel.store.page(offset, limit, sort, reverse)],
+            "len": lambda: len(self.hotel.store),
+            "contains": lambda room_no: room_no in self.hotel.store,
+            "rooms": lambda: sorted(self.hotel.store.rooms()),
+            "insert_many": self.insert_many,
+            "delete_many": self.delete_many,
+            # Allocator
+            "allocate": self.allocate,
+            "allocate_stay": self.allocate_stay,
+            "take": lambda room: self.hotel.rooms.take(room),
+            "release": self.release,
+            "vacancy": lambda category: self.hotel.rooms.vacancy(category),
+            "vacancies": lambda: self.hotel.rooms.vacancies(),
+            # Search
+            "by_name": lambda prefix, limit=None: self.hotel.search.by_name(prefix, limit),
+            "by_mobile": lambda mobile: self.hotel.search.by_mobile(mobile),
+            # Reservations
+            "free_rooms": lambda ranges, arrival, departure: self.hotel.book.free_rooms(
+                RoomRanges(ranges), date.fromisoformat(arrival), date.fromisoformat(departure)),
+            "find_room": lambda ranges, arrival, departure: self.hotel.book.find_room(
+                RoomRanges(ranges), date.fromisoformat(arrival), date.fromisoformat(departure)),
+            "reserve": lambda reservation: self.hotel.book.reserve(
+                reservation_from_wire(reservation)),
+            "cancel": lambda room, arrival: self._reservation(
+                self.hotel.book.cancel(room, date.fromisoformat(arrival))),
+            "claim": lambda room, arrival: self._reservation(
+                self.hotel.book.claim(room, date.fromisoformat(arrival))),
+            "arriving": lambda room: self._reservation(self.hotel.book.arriving(room)),
+            "upcoming": lambda: [self._reservation(r) for r in self.hotel.book.upcoming()],
+        }
+
+    @staticmethod
+    def _reservation(reservation):
+        return to_wire(reservation, RESERVATION_FIELDS)
+
+    # ----- Store -----
+    def scan(self, room_no=None, ranges=None, name_prefix=None):
+        rooms = RoomRanges(ranges) if ranges is not None else None
+        return [to_wire(r) for r in self.hotel.store.scan(room_no, rooms, name_prefix)]
+
+    def insert_many(self, records, held=None):
+        """Insert bookings and update the allocator, search index and stays."""
+        bookings = [from_wire(r) for r in records]
+        self.hotel.store.insert_many(bookings)
+        for booking in bookings:
+            self._unhold(booking.room_no, held)
+            self.hotel.rooms.take(booking.room_no)
+            self.hotel.search.add(booking)
+            self.hotel.book.start_stay(booking)
+
+    def delete_many(self, room_numbers):
+        """Check out rooms, archiving the stays, and return the removed bookings."""
+        removed, _ = self.hotel.check_out_batch(room_numbers)
+        return [to_wire(r) for r in removed]
+
+    # ----- Allocator -----
+    def _hold(self, room, held):
+        self.held.add(room)
+        if held is not None:
+            held.add(room)
+
+    def _unhold(self, room, held):
+        self.held.discard(room)
+        if held is not None:
+            held.discard(room)
+
+    def allocate(self, category, held=None):
+        room = self.hotel.rooms.allocate(category)
+        if room:
+            self._hold(room, held)
+        return room
+
+    def allocate_stay(self, category, arrival, departure, held=None):
+        from reservations import allocate_stay
+        room = allocate_stay(self.hotel.rooms, self.hotel.book, category,
+                             date.fromisoformat(arrival), date.fromisoformat(departure))
+        if room:
+            self._hold(room, held)
+        return room
+
+    def release(self, room, held=None):
+        if held is not None:
+            held.discard(room)
+        if room in self.held:
+            self.held.discard(room)
+            self.hotel.rooms.release(room)
+
+    # ----- Connections -----
+    def dispatch(self, request, held=None):
+        """Run one request; `held` is the set of rooms its connection holds."""
+        op = request.get("op")
+        handler = self.ops.get(op)
+        if handler is None:
+            return {"error": f"Unknown operation: {op!r}", "type": "RuntimeError"}
+        try:
+            args = request.get("args", {})
+            if op in self.HOLDING:
+                args = dict(args, held=held)
+            with metrics.timer(f"service.{op}"):
+                return {"ok": handler(**args)}
+        except ValueError as e:
+            return {"error": str(e), "type": "ValueError"}
+        except Exception as e:
+            return {"error": f"{type(e).__name__}: {e}", "type": "RuntimeError"}
+
+    async def handle(self, reader, writer):
+        """Answer one client's requests in order until it disconnects, then
+        release the rooms it allocated but never booked."""
+        held = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    reply = self.dispatch(json.loads(line), held)
+                except json.JSONDecodeError:
+                    reply = {"error": "Malformed request", "type": "RuntimeError"}
+                writer.write(json.dumps(reply).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            for room in list(held):
+                self.release(room)
+            writer.close()
+
+
+async def serve(hotel, address=SERVICE):
+    service = BookingService(hotel)
+    family, where = parse_address(address)
+    if family == socket.AF_UNIX:
+        if os.path.exists(where):
+            os.remove(where)
+        server = await asyncio.start_unix_server(service.handle, where)
+    else:
+        server = await asyncio.start_server(service.handle, *where)
+    print(f"Booking service listening on {address} ({len(hotel.store)} guests checked in)")
+    async with server:
+        await server.serve_forever()
+
+
+# -----------------------------
+# Client
+# -----------------------------
+class ServiceClient:
+    """Blocking JSON-lines client; one connection shared by a process's threads."""
+
+    def __init__(self, address=SERVICE):
+        family, where = parse_address(address)
+        self.sock = socket.socket(family, socket.SOCK_STREAM)
+        self.sock.connect(where)
+        self.file = self.sock.makefile("rwb")
+        self.lock = threading.Lock()
+
+    def call(self, op, **args):
+        with self.lock:
+            self.file.write(json.dumps({"op": op, "args": args}).encode() + b"\n")
+            self.file.flush()
+            line = self.file.readline()
+        if not line:
+            raise ConnectionError("Booking service closed the connection.")
+        reply = json.loads(line)
+        if "error" in reply:
+            raise (ValueError if reply["type"] == "ValueError" else RuntimeError)(reply["error"])
+        return reply["ok"]
+
+    def close(self):
+        self.file.close()
+        self.sock.close()
+
+
+class RemoteStore:
+    """Booking store API answered by the booking service.
+
+    The service updates its allocator, search index, stays and history
+    as part of insert / delete, so callers skip their own bookkeeping
+    when `remote` is set.
+    """
+
+    remote = True
+
+    def __init__(self, address=SERVICE):
+        self.client = ServiceClient(address)
+
+    def proxies(self):
+        """(rooms, search, book) stand-ins sharing this connection."""
+        return RemoteAllocator(self.client), RemoteIndex(self.client), RemoteBook(self.client)
+
+    def load(self):
+        pass
+
+    def save(self):
+        pass
+
+    def compact(self):
+        pass
+
+    def close(self):
+        self.client.close()
+
+    def get(self, room_no):
+        return from_wire(self.client.call("get", room_no=room_no))
+
+    def rooms(self):
+        return set(self.client.call("rooms"))
+
+    def __contains__(self, room_no):
+        return self.client.call("contains", room_no=room_no)
+
+    def __iter__(self):
+        return iter(self.scan())
+
+    def __len__(self):
+        return self.client.call("len")
+
+    def scan(self, room_no=None, rooms=None, name_prefix=None):
+        ranges = as_ranges(rooms) if rooms is not None else None
+        return [from_wire(r) for r in self.client.call(
+            "scan", room_no=room_no, ranges=ranges, name_prefix=name_prefix)]
+
+    def page(self, offset, limit, sort="room", reverse=False):
+        return [from_wire(r) for r in self.client.call(
+            "page", offset=offset, limit=limit, sort=sort, reverse=reverse)]
+
+    def insert(self, record):
+        self.insert_many([record])
+
+    def insert_many(self, records):
+        self.client.call("insert_many", records=[to_wire(r) for r in records])
+
+    def delete(self, room_no):
+        removed = self.delete_many([room_no])
+        return removed[0] if removed else None
+
+    def delete_many(self, room_numbers):
+        return [from_wire(r) for r in self.client.call("delete_many", room_numbers=list(room_numbers))]
+
+
+class RemoteAllocator:
+    """RoomAllocator API backed by the service's allocator."""
+
+    def __init__(self, client):
+        self.client = client
+
+    def allocate(self, category):
+        return self.client.call("allocate", category=category)
+
+    def allocate_stay(self, category, arrival, departure):
+        return self.client.call("allocate_stay", category=category,
+                                arrival=arrival.isoformat(), departure=departure.isoformat())
+
+    def take(self, room):
+        self.client.call("take", room=room)
+
+    def release(self, room):
+        self.client.call("release", room=room)
+
+    def vacancy(self, category):
+        return self.client.call("vacancy", category=category)
+
+    def vacancies(self):
+        return {int(k): v for k, v in self.client.call("vacancies").items()}
+
+
+class RemoteIndex:
+    """GuestIndex API; the service indexes bookings itself on insert / delete."""
+
+    def __init__(self, client):
+        self.client = client
+
+    def add(self, record):
+        pass
+
+    def remove(self, record):
+        pass
+
+    def by_name(self, prefix, limit=None):
+        return self.client.call("by_name", prefix=prefix, limit=limit)
+
+    def by_mobile(self, mobile):
+        return self.client.call("by_mobile", mobile=mobile)
+
+
+class RemoteBook:
+    """ReservationBook API; stays are tracked by the service on insert / delete."""
+
+    def __init__(self, client):
+        self.client = client
+
+    def start_stay(self, record):
+        pass
+
+    def end_stay(self, record):
+        pass
+
+    def free_rooms(self, rooms, arrival, departure):
+        return self.client.call("free_rooms", ranges=as_ranges(rooms),
+                                arrival=arrival.isoformat(), departure=departure.isoformat())
+
+    def find_room(self, rooms, arrival, departure):
+        return self.client.call("find_room", ranges=as_ranges(rooms),
+                                arrival=arrival.isoformat(), departure=departure.isoformat())
+
+    def reserve(self, reservation):
+        self.client.call("reserve", reservation=to_wire(reservation, RESERVATION_FIELDS))
+
+    def cancel(self, room, arrival):
+        return reservation_from_wire(self.client.call("cancel", room=room,
+                                                      arrival=arrival.isoformat()))
+
+    def claim(self, room, arrival):
+        return reservation_from_wire(self.client.call("claim", room=room,
+                                                      arrival=arrival.isoformat()))
+
+    def arriving(self, room):
+        return reservation_from_wire(self.client.call("arriving", room=room))
+
+    def upcoming(self):
+        return [reservation_from_wire(r) for r in self.client.call("upcoming")]
+
+
+# -----------------------------
+# Run Program
+# -----------------------------
+def main(argv):
+    from main import HotelSystem
+    from storage import STORE_FORMAT, open_store
+
+    fmt = argv[argv.index("--format") + 1] if "--format" in argv else STORE_FORMAT
+    if fmt == "service":
+        fmt = "pickle"
+    address = argv[argv.index("--address") + 1] if "--address" in argv else SERVICE
+    try:
+        asyncio.run(serve(HotelSystem(open_store(fmt)), address))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Hotel Management - Warm-Start Snapshot
+The console's bookings, allocator, search and stay indexes in one file
+
+Written on a clean exit (and every STAYMITAR_SNAPSHOT_INTERVAL seconds
+of use), read back with one read on the next launch. It records how
+many bytes of hotel.dat it covers plus a checksum of the last few KiB
+of them; if hotel.dat still starts with those bytes, only the entries
+appended after them are replayed. Otherwise the snapshot is ignored
+and hotel.dat is loaded in full.
+"""
+
+import gc
+import os
+import pickle
+import sys
+
+import metrics
+from allocator import RoomAllocator, as_ranges
+from inventory import ROOM_TYPES
+from reservations import RESERVATIONS_FILE, ReservationBook
+from searchindex import GuestIndex
+from storage import DATA_FILE, BookingStore, apply_changes, file_version, replace_file
+
+SNAPSHOT_FILE = os.environ.get("STAYMITAR_SNAPSHOT", "hotel.snap")
+
+# Seconds between snapshots while the console is in use (0: exit only)
+SNAPSHOT_INTERVAL = float(os.environ.get("STAYMITAR_SNAPSHOT_INTERVAL", "300"))
+
+# Bumped whenever the snapshot layout changes; older snapshots are ignored
+FORMAT = 1
+
+
+# -----------------------------
+# Helpers
+# -----------------------------
+def _layout():
+    """Room ranges per category; a snapshot's allocator is only reused
+    while the inventory is unchanged."""
+    return {category: as_ranges(info["rooms"]) for category, info in ROOM_TYPES.items()}
+
+
+# -----------------------------
+# Save & Restore
+# -----------------------------
+@metrics.timed("snapshot.save")
+def save(store, rooms, search, book, path=SNAPSHOT_FILE):
+    """Write the snapshot (BookingStore only; other stores load quickly)."""
+    if not isinstance(store, BookingStore):
+        return False
+    apply_changes(store, rooms, search, book, *store.refresh())
+    state = {
+        "format": FORMAT,
+        "data": os.path.abspath(store.path),
+        "store": store.checkpoint(),
+        "layout": _layout(),
+        "rooms": rooms,
+        "search": search,
+        "reservations": file_version(book.path),
+        "book": book,
+    }
+    replace_file(path, [pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)])
+    return True
+
+
+@metrics.timed("snapshot.load")
+def load(data_path=DATA_FILE, path=SNAPSHOT_FILE):
+    """(store, rooms, search, book) from the snapshot plus the journal
+    tail, or None if there is no usable snapshot."""
+    # The collector would otherwise rescan the young objects over and
+    # over while unpickling creates them, about doubling the load time
+    gc.disable()
+    try:
+        with open(path, "rb") as f:
+            state = pickle.loads(f.read())
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        return None
+    finally:
+        gc.enable()
+    if (not isinstance(state, dict) or state.get("format") != FORMAT
+            or state["data"] != os.path.abspath(data_path)):
+        return None
+
+    store = BookingStore(data_path, load=False)
+    changes = store.resume(state["store"])
+    if changes is None:
+        return None
+    if state["layout"] != _layout() or state["reservations"] != file_version(RESERVATIONS_FILE):
+        # The inventory or reservations changed since; rebuild from the bookings
+        return (store, RoomAllocator(ROOM_TYPES, store.rooms()), GuestIndex(store),
+                ReservationBook(store))
+    rooms, search, book = state["rooms"], state["search"], state["book"]
+    apply_changes(store, rooms, search, book, *changes)
+    return store, rooms, search, book
+
+
+# -----------------------------
+# Run Program
+# -----------------------------
+if __name__ == "__main__":
+    # python snapshot.py: rebuild the snapshot from hotel.dat
+    store = BookingStore()
+    rooms = RoomAllocator(ROOM_TYPES, store.rooms())
+    save(store, rooms, GuestIndex(store), ReservationBook(store))
+    print(f"Snapshot of {len(store)} bookings written to {SNAPSHOT_FILE}")
+    sys.exit(0)
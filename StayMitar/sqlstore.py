@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Hotel Management - SQLite Booking Store
+Indexed bookings in a local WAL-mode database
+"""
+
+import sqlite3
+from datetime import date
+
+import metrics
+from booking import Booking
+from storage import DURABILITY, mobile_of, room_of
+
+SQLITE_FILE = "hotel.db"
+
+SYNCHRONOUS = {"none": "OFF", "group": "NORMAL", "each": "FULL"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS bookings (
+    room_no   INTEGER PRIMARY KEY,
+    name      TEXT NOT NULL,
+    address   TEXT NOT NULL,
+    mobile_no TEXT NOT NULL,
+    price     REAL NOT NULL,
+    days      INTEGER NOT NULL DEFAULT 0,
+    arrival   TEXT,
+    departure TEXT,
+    payment   INTEGER
+);
+CREATE INDEX IF NOT EXISTS bookings_mobile ON bookings (mobile_no);
+CREATE INDEX IF NOT EXISTS bookings_name ON bookings (name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS bookings_price ON bookings (price);
+"""
+
+COLUMNS = "name, address, mobile_no, room_no, price, days, arrival, departure, payment"
+PLACEHOLDERS = ", ".join("?" * len(COLUMNS.split(", ")))
+
+# Columns added after the first schema, for databases created before them
+ADDED_COLUMNS = {"arrival": "TEXT", "departure": "TEXT", "payment": "INTEGER"}
+
+# Guest-list sort orders (see storage.SORT_KEYS)
+ORDER_BY = {
+    "room": "room_no",
+    "name": "name COLLATE NOCASE, room_no",
+    "bill": "price, room_no",
+}
+
+
+# -----------------------------
+# Row Helpers
+# -----------------------------
+def _to_record(row):
+    if metrics.ENABLED:
+        metrics.add(records_decoded=1)
+    *fields, arrival, departure, payment = row
+    return Booking(*fields,
+                   date.fromisoformat(arrival) if arrival else None,
+                   date.fromisoformat(departure) if departure else None,
+                   payment=payment)
+
+
+def _iso(day):
+    return day.isoformat() if day else None
+
+
+def _to_row(record):
+    return (
+        record.name,
+        record.address,
+        mobile_of(record),
+        room_of(record),
+        float(record.price or 0),
+        int(getattr(record, "days", 0) or 0),
+        _iso(getattr(record, "arrival", None)),
+        _iso(getattr(record, "departure", None)),
+        getattr(record, "payment", None),
+    )
+
+
+# -----------------------------
+# SQLite Store
+# -----------------------------
+class SQLiteStore:
+    """Same API as BookingStore, answered by indexed SQLite queries."""
+
+    def __init__(self, path=SQLITE_FILE):
+        self.path = path
+        self.conn = None
+        self.load()
+
+    # ----- Persistence -----
+    def load(self):
+        """Open the database in WAL mode and create the schema."""
+        self.close()
+        # Autocommit: each change is its own short write transaction.
+        # The GUI worker thread shares this connection (see worker.py).
+        self.conn = sqlite3.connect(self.path, isolation_level=None, timeout=10,
+                                    check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        # WAL already commits in groups; FULL syncs every transaction, OFF never
+        self.conn.execute(f"PRAGMA synchronous={SYNCHRONOUS[DURABILITY]}")
+        self.conn.executescript(SCHEMA)
+        existing = {row[1] for row in self.conn.execute("PRAGMA table_info(bookings)")}
+        for column, kind in ADDED_COLUMNS.items():
+            if column not in existing:
+                self.conn.execute(f"ALTER TABLE bookings ADD COLUMN {column} {kind}")
+
+    def save(self):
+        """Changes are committed as they happen; fold the WAL back in."""
+        self.conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+
+    compact = save
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    # ----- Lookup -----
+    def get(self, room_no):
+        """Return the record for a room, or None if it is free."""
+        row = self.conn.execute(
+            f"SELECT {COLUMNS} FROM bookings WHERE room_no = ?", (room_no,)
+        ).fetchone()
+        return _to_record(row) if row else None
+
+    def rooms(self):
+        """Return the set of occupied room numbers."""
+        return {row[0] for row in self.conn.execute("SELECT room_no FROM bookings")}
+
+    def __contains__(self, room_no):
+        return self.conn.execute(
+            "SELECT 1 FROM bookings WHERE room_no = ?", (room_no,)
+        ).fetchone() is not None
+
+    def __iter__(self):
+        cursor = self.conn.execute(f"SELECT {COLUMNS} FROM bookings ORDER BY rowid")
+        for row in cursor:
+            yield _to_record(row)
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM bookings").fetchone()[0]
+
+    def scan(self, room_no=None, rooms=None, name_prefix=None):
+        """Yield matching records straight off an indexed cursor."""
+        where, params = [], []
+        if room_no is not None:
+            where.append("room_no = ?")
+            params.append(room_no)
+        if isinstance(rooms, range) and rooms.step == 1:
+            where.append("room_no BETWEEN ? AND ?")
+            params += [rooms.start, rooms.stop - 1]
+        elif hasattr(rooms, "ranges"):
+            where.append("(" + " OR ".join(["room_no BETWEEN ? AND ?"] * len(rooms.ranges)) + ")")
+            params += [room for span in rooms.ranges for room in span]
+        elif rooms is not None:
+            rooms = list(rooms)
+            where.append(f"room_no IN ({', '.join('?' * len(rooms))})")
+            params += rooms
+        if name_prefix:
+            escaped = name_prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            where.append("name LIKE ? ESCAPE '\\'")
+            params.append(escaped + "%")
+
+        query = f"SELECT {COLUMNS} FROM bookings"
+        if where:
+            query += " WHERE " + " AND ".join(where)
+        for row in self.conn.execute(query + " ORDER BY rowid", params):
+            yield _to_record(row)
+
+    def page(self, offset, limit, sort="room", reverse=False):
+        """Return one page of records via an indexed ORDER BY ... LIMIT."""
+        order = ORDER_BY[sort]
+        if reverse:
+            order = ", ".join(f"{column} DESC" for column in order.split(", "))
+        rows = self.conn.execute(
+            f"SELECT {COLUMNS} FROM bookings ORDER BY {order} LIMIT ? OFFSET ?",
+            (limit, offset),
+        )
+        return [_to_record(row) for row in rows]
+
+    # ----- Changes -----
+    def insert(self, record):
+        """Add a booking; the room_no key rejects double allocation."""
+        try:
+            self.conn.execute(
+                f"INSERT INTO bookings ({COLUMNS}) VALUES ({PLACEHOLDERS})",
+                _to_row(record),
+            )
+        except sqlite3.IntegrityError:
+            raise ValueError(f"Room {room_of(record)} is already occupied.") from None
+
+    def insert_many(self, records):
+        """Add a group of bookings in one transaction (all or nothing)."""
+        rows = [_to_row(record) for record in records]
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            self.conn.executemany(
+                f"INSERT INTO bookings ({COLUMNS}) VALUES ({PLACEHOLDERS})", rows)
+        except sqlite3.IntegrityError:
+            self.conn.execute("ROLLBACK")
+            raise ValueError("Some rooms in the group are already occupied.") from None
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
+
+    def delete(self, room_no):
+        """Remove the booking for a room and return it (None if not found)."""
+        removed = self.delete_many([room_no])
+        return removed[0] if removed else None
+
+    def delete_many(self, room_numbers):
+        """Remove several bookings in one transaction; returns the removed records."""
+        removed = []
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            for room_no in room_numbers:
+                record = self.get(room_no)
+                if record is not None:
+                    self.conn.execute("DELETE FROM bookings WHERE room_no = ?", (room_no,))
+                    removed.append(record)
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        return removed
@@ -0,0 +1,716 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Hotel Management - Booking Storage
+Shared store for hotel.dat used by the console and GUI front ends
+"""
+
+import atexit
+import os
+import pickle
+import re
+import sys
+import threading
+import zlib
+from collections import Counter
+from contextlib import contextmanager
+
+import metrics
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, so desks must not rewrite at once
+    fcntl = None
+
+DATA_FILE = "hotel.dat"
+
+# Booking store: "pickle" (hotel.dat), "fixed" (hotel.rec) or "sqlite" (hotel.db)
+STORE_FORMAT = os.environ.get("STAYMITAR_FORMAT", "pickle")
+
+# Append tombstones on checkout instead of rewriting hotel.dat
+JOURNAL = os.environ.get("STAYMITAR_JOURNAL", "1") != "0"
+
+# Compact the journal once dead entries outnumber live ones (and this many)
+COMPACT_MIN = 100
+
+# When appends reach the disk: "none" (buffered, no fsync), "group" (one
+# fsync per group of writers) or "each" (write and fsync every append)
+DURABILITY = os.environ.get("STAYMITAR_DURABILITY", "group")
+
+# Extra seconds a group waits for more writers (0: only those queued
+# behind the previous fsync), and the size that flushes a group at once
+GROUP_INTERVAL = float(os.environ.get("STAYMITAR_GROUP_INTERVAL", "0"))
+GROUP_BYTES = 64 * 1024
+
+# How long "none" mode buffers appends before writing them
+BUFFER_SECONDS = 0.05
+
+# Bytes before a snapshot's offset that must still match to resume from it
+CHECK_BYTES = 4096
+
+# Bytes an unreadable entry is copied to before it is dropped (hotel.dat.damaged)
+DAMAGED_SUFFIX = ".damaged"
+
+# Start of a protocol 2-5 pickle, for finding the entry after a damaged one
+PICKLE_START = re.compile(rb"\x80[\x02-\x05]")
+READ_BLOCK = 1 << 20
+
+
+# -----------------------------
+# Record Helpers
+# -----------------------------
+class Record:
+    """Fallback for records pickled from a class the running script lacks."""
+
+
+class Tombstone:
+    """Journal entry marking a room as checked out."""
+
+    def __init__(self, room_no):
+        self.room_no = room_no
+
+
+class _RecordUnpickler(pickle.Unpickler):
+    """Unpickler that tolerates booking classes defined in another script."""
+
+    def find_class(self, module, name):
+        # A __main__ class belongs to whichever script wrote the pickle, not
+        # to the running one (the old GUI's Booking kept a __dict__ that the
+        # slotted booking.Booking cannot take), so all of them load as Record
+        if module == "__main__":
+            return Record
+        return super().find_class(module, name)
+
+
+def next_pickle(f, offset, end):
+    """Offset of the next pickle start after `offset`, or None."""
+    f.seek(offset)
+    while offset < end:
+        block = f.read(min(READ_BLOCK, end - offset) + 1)
+        match = PICKLE_START.search(block)
+        if match:
+            return offset + match.start()
+        if len(block) <= 1:
+            return None
+        offset += len(block) - 1
+        f.seek(offset)
+    return None
+
+
+def iter_records(path=DATA_FILE, on_torn=None, offset=0, on_end=None, on_corrupt=None):
+    """Stream entries (records and Tombstones) from a pickle file one at a
+    time, so a caller that breaks out early never decodes the rest.
+
+    Reading starts at byte offset. An unreadable entry followed by a
+    readable one is skipped and reported to on_corrupt(start, end). One
+    that runs to the end of the file (cut short by a crash mid-append)
+    ends the stream; on_torn, if given, is called with the offset where
+    the complete entries end. on_end gets that offset whenever the
+    stream runs out, torn or not.
+    """
+    try:
+        with open(path, "rb") as f:
+            f.seek(offset)
+            size = os.fstat(f.fileno()).st_size
+            unpickler = _RecordUnpickler(f)
+            end = offset
+            bad = None  # start of the unreadable bytes being skipped
+            try:
+                while True:
+                    start = f.tell()
+                    try:
+                        entry = unpickler.load()
+                    except Exception as e:
+                        if bad is None:
+                            if isinstance(e, EOFError) and f.tell() == start:
+                                break
+                            bad = start
+                        resume = next_pickle(f, start + 1, size)
+                        if resume is None:
+                            if on_torn is not None:
+                                on_torn(bad)
+                            break
+                        f.seek(resume)
+                        unpickler = _RecordUnpickler(f)
+                        continue
+                    if bad is not None:
+                        if on_corrupt is not None:
+                            on_corrupt(bad, start)
+                        bad = None
+                    end = f.tell()
+                    if metrics.ENABLED:
+                        metrics.add(records_decoded=1)
+                    yield entry
+            finally:
+                if metrics.ENABLED:
+                    metrics.add(bytes_read=f.tell() - offset)
+            if on_end is not None:
+                on_end(end)
+    except FileNotFoundError:
+        if on_end is not None:
+            on_end(0)
+
+
+def keep_damaged(path, ranges):
+    """Append the (start, end) byte ranges of a file to path.damaged, so
+    entries that could not be read are kept before they are dropped."""
+    if not ranges:
+        return
+    with open(path, "rb") as src, open(path + DAMAGED_SUFFIX, "ab") as out:
+        for start, end in ranges:
+            src.seek(start)
+            out.write(src.read(end - start))
+        out.flush()
+        os.fsync(out.fileno())
+
+
+def file_version(path):
+    """(inode, size, mtime) of a file, or None if it is missing; any
+    rewrite, append or replacement changes it."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_ino, st.st_size, st.st_mtime_ns
+
+
+def file_checksum(path, offset, size=CHECK_BYTES):
+    """CRC32 of the `size` bytes of a file that end at offset."""
+    start = max(offset - size, 0)
+    try:
+        with open(path, "rb") as f:
+            f.seek(start)
+            return zlib.crc32(f.read(offset - start))
+    except FileNotFoundError:
+        return None
+
+
+def room_of(record):
+    """Return the room number of a record (GUI `room_no` or console `room`)."""
+    room = getattr(record, "room_no", None)
+    if room is None:
+        room = getattr(record, "room", None)
+    return room
+
+
+def mobile_of(record):
+    """Return the mobile number of a record (`mobile_no` or GUI `mobile`)."""
+    return str(getattr(record, "mobile_no", None) or getattr(record, "mobile", "") or "")
+
+
+# Guest-list sort orders, as key(record, room_no)
+SORT_KEYS = {
+    "room": lambda record, room: room,
+    "name": lambda record, room: (str(record.name).upper(), room),
+    "bill": lambda record, room: (float(record.price or 0), room),
+}
+
+
+def matches(record, name_prefix):
+    """Name-prefix filter shared by the stores' scan() methods."""
+    return name_prefix is None or str(record.name).upper().startswith(name_prefix.upper())
+
+
+def page_of(order, offset, limit, reverse=False):
+    """Slice one page out of an ascending list, counting from the end if reversed."""
+    if not reverse:
+        return order[offset:offset + limit]
+    end = max(len(order) - offset, 0)
+    return order[max(end - limit, 0):end][::-1]
+
+
+# -----------------------------
+# Durable Writes
+# -----------------------------
+def _fsync_dir(path):
+    """Make a rename in path's directory durable (POSIX only)."""
+    if os.name != "posix":
+        return
+    fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+@contextmanager
+def file_lock(path, shared=False):
+    """Hold an advisory lock on path.lock: shared for appends, exclusive
+    for a rewrite, so no append lands in a file being replaced."""
+    if fcntl is None:
+        yield
+        return
+    with open(path + ".lock", "ab") as f:
+        fcntl.flock(f, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def replace_file(path, chunks, durability=None):
+    """Crash-safe rewrite: write path.tmp (truncating any leftover from a
+    crashed run), fsync it, then os.replace it over path."""
+    durability = durability or DURABILITY
+    tmp = path + ".tmp"
+    written = 0
+    with open(tmp, "wb") as f:
+        for chunk in chunks:
+            f.write(chunk)
+            written += len(chunk)
+        if durability != "none":
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(tmp, path)
+    if durability != "none":
+        _fsync_dir(path)
+    return written
+
+
+@contextmanager
+def _unlocked():
+    yield
+
+
+class GroupCommitLog:
+    """Append-only file written in groups.
+
+    In "group" mode writers that arrive while a write + fsync is in
+    flight queue up and go out together in the next one; the leader of
+    a group can also wait GROUP_INTERVAL for more to join. Every writer
+    returns once its data is on disk. "each" flushes on every append
+    without waiting for a group; "none" returns at once and a timer flushes without fsync
+    after BUFFER_SECONDS.
+    """
+
+    def __init__(self, path, durability=None, interval=GROUP_INTERVAL, max_bytes=GROUP_BYTES,
+                 locked=False):
+        self.path = path
+        self.locked = locked  # take file_lock's shared lock for each write
+        self.durability = durability or DURABILITY
+        self.interval = interval
+        self.max_bytes = max_bytes
+        self.pending = []
+        self.pending_bytes = 0
+        self.queued = 0
+        self.written = 0
+        self.leader = False
+        self.flushing = False
+        self.timer = None
+        self.cond = threading.Condition()
+        atexit.register(self.flush)
+
+    def append(self, data):
+        """Queue data; returns once it is as durable as the mode promises."""
+        with self.cond:
+            self.pending.append(data)
+            self.pending_bytes += len(data)
+            self.queued += 1
+            ticket = self.queued
+            if self.durability == "each" or self.pending_bytes >= self.max_bytes:
+                self._flush()
+            elif self.durability == "none":
+                if self.timer is None:
+                    self.timer = threading.Timer(BUFFER_SECONDS, self.flush)
+                    self.timer.daemon = True
+                    self.timer.start()
+                return
+            while self.written < ticket:
+                if self.flushing or self.leader:
+                    self.cond.wait()
+                    continue
+                # Lead the next group, optionally letting more writers join
+                self.leader = True
+                if self.interval:
+                    self.cond.wait(self.interval)
+                self.leader = False
+                self._flush()
+
+    def _flush(self):
+        """Write the queued group. The caller holds the lock; it is
+        released during the I/O so the next group can queue up."""
+        while self.flushing:
+            self.cond.wait()
+        self.timer = None
+        if not self.pending:
+            return
+        data = b"".join(self.pending)
+        queued = self.queued
+        self.pending = []
+        self.pending_bytes = 0
+        self.flushing = True
+        self.cond.release()
+        try:
+            with file_lock(self.path, shared=True) if self.locked else _unlocked():
+                with open(self.path, "ab") as f:
+                    f.write(data)
+                    if self.durability != "none":
+                        f.flush()
+                        os.fsync(f.fileno())
+        finally:
+            self.cond.acquire()
+            self.flushing = False
+            self.cond.notify_all()
+        self.written = max(self.written, queued)
+        if metrics.ENABLED:
+            metrics.add(bytes_written=len(data))
+
+    def flush(self):
+        """Write anything still queued."""
+        with self.cond:
+            self._flush()
+
+    def discard(self):
+        """Drop queued appends that a full rewrite has made redundant."""
+        with self.cond:
+            while self.flushing:
+                self.cond.wait()
+            self.pending = []
+            self.pending_bytes = 0
+            self.written = self.queued
+            self.cond.notify_all()
+
+
+_logs = {}
+_logs_lock = threading.Lock()
+
+
+def log_for(path):
+    """The process's GroupCommitLog for an append-only file other than
+    hotel.dat (history segments, reservations.dat)."""
+    key = os.path.abspath(path)
+    with _logs_lock:
+        if key not in _logs:
+            _logs[key] = GroupCommitLog(path)
+        return _logs[key]
+
+
+# -----------------------------
+# Booking Store
+# -----------------------------
+class BookingStore:
+    """Owns hotel.dat and keeps a room_no -> record index in memory.
+
+    In journal mode check-ins append a record and checkouts append a
+    Tombstone; loading replays the file in order to rebuild the index.
+    A rewrite first replays what other desks appended, under file_lock.
+    """
+
+    def __init__(self, path=DATA_FILE, journal=None, durability=None, load=True):
+        self.path = path
+        self.journal = JOURNAL if journal is None else journal
+        self.log = GroupCommitLog(path, durability, locked=True)
+        self.index = {}
+        self.dead = 0
+        self.entries = 0
+        self.offset = 0
+        self.checksum = None  # file_checksum up to offset, to check the tail is ours
+        self.version = None
+        self.orders = {}
+        self.damaged = []
+        # First-seen records of rooms a rewrite caught up on, for refresh()
+        self.unreported = {}
+        if load:
+            self.load()
+
+    # ----- Persistence -----
+    def load(self):
+        """Replay hotel.dat once and rebuild the room index."""
+        self.index = {}
+        self.entries = 0
+        self.damaged = []
+        torn = []
+        self._replay(0, on_torn=torn.append)
+        self._cut(torn)
+        self.version = file_version(self.path)
+
+    def _cut(self, torn):
+        """Cut off a half-written last entry so new appends stay readable,
+        keeping its bytes in hotel.dat.damaged."""
+        if torn:
+            keep_damaged(self.path, [(torn[0], os.path.getsize(self.path))])
+            os.truncate(self.path, torn[0])
+
+    def _skipped(self, start, end):
+        print(f"⚠️ {self.path}: skipped an unreadable entry at bytes {start}-{end}",
+              file=sys.stderr)
+        self.damaged.append((start, end))
+
+    def _replay(self, offset, on_torn=None, changed=None):
+        """Apply the entries from offset on to the index. The first record
+        each touched room had is put in changed (None if it was free)."""
+        ends = []
+        for record in iter_records(self.path, on_torn, offset, ends.append, self._skipped):
+            self.entries += 1
+            room = room_of(record)
+            if room is None:
+                continue
+            if changed is not None and room not in changed:
+                changed[room] = self.index.get(room)
+            if isinstance(record, Tombstone):
+                self.index.pop(room, None)
+            else:
+                self.index[room] = record
+        self.offset = ends[0]
+        self.checksum = file_checksum(self.path, self.offset)
+        self.dead = self.entries - len(self.index)
+        self.orders = {}
+
+    @metrics.timed("refresh")
+    def refresh(self):
+        """Catch up with changes other processes made to hotel.dat.
+
+        Nothing is read while the file's inode, size and mtime are the
+        ones last seen. If the same file only grew, just the appended
+        tail is replayed; anything else reloads it. A rewrite can reuse
+        the inode, so the bytes before the tail must still match the
+        checksum taken when they were read. Returns the records
+        (added, removed) so callers can update indexes built on them.
+        """
+        self.log.flush()
+        changed, self.unreported = self.unreported, {}
+        self._catch_up(changed)
+        return self._changes(changed)
+
+    def _catch_up(self, changed):
+        """Replay the appended tail, or reload if hotel.dat was replaced,
+        putting each touched room's first-seen record in changed."""
+        version = file_version(self.path)
+        if version == self.version:
+            return
+        if (version is not None and self.version is not None
+                and version[0] == self.version[0] and version[1] >= self.offset
+                and file_checksum(self.path, self.offset) == self.checksum):
+            self._replay(self.offset, changed=changed)
+        else:
+            old = self.index
+            self.load()
+            for room, record in self.index.items():
+                # Keep (and don't report) records a compaction merely rewrote
+                if room in old and pickle.dumps(old[room], 2) == pickle.dumps(record, 2):
+                    self.index[room] = old[room]
+            for room in old.keys() | self.index.keys():
+                changed.setdefault(room, old.get(room))
+        self.version = version
+
+    def _changes(self, changed):
+        """(added, removed) records from _replay's first-seen records."""
+        added = [self.index[room] for room in changed
+                 if room in self.index and self.index[room] is not changed[room]]
+        removed = [record for room, record in changed.items()
+                   if record is not None and self.index.get(room) is not record]
+        return added, removed
+
+    def checkpoint(self):
+        """The index and how much of hotel.dat it covers, for a snapshot.
+        Call refresh() first so the index matches the file up to offset."""
+        version = file_version(self.path)
+        return {
+            "index": self.index,
+            "entries": self.entries,
+            "offset": self.offset,
+            "inode": version[0] if version else None,
+            "checksum": file_checksum(self.path, self.offset),
+        }
+
+    def resume(self, state):
+        """Adopt a checkpoint() taken by an earlier run and replay only what
+        was appended since. Returns refresh()'s (added, removed), or None
+        (leaving the store unloaded) if hotel.dat was rewritten meanwhile."""
+        version = file_version(self.path)
+        if (version is None or version[0] != state["inode"] or version[1] < state["offset"]
+                or file_checksum(self.path, state["offset"]) != state["checksum"]):
+            return None
+        self.index = state["index"]
+        self.entries = state["entries"]
+        changed, torn = {}, []
+        self._replay(state["offset"], on_torn=torn.append, changed=changed)
+        self._cut(torn)
+        self.version = file_version(self.path)
+        return self._changes(changed)
+
+    @metrics.timed("save")
+    def save(self):
+        """Rewrite hotel.dat from the in-memory index, crash-safely, after
+        replaying what other desks appended since it was last read."""
+        # Write our queued appends first (their flush takes the lock too),
+        # so a reload under the lock can't lose them
+        self.log.flush()
+        with file_lock(self.path):
+            self._catch_up(self.unreported)
+            self._rewrite()
+
+    def _rewrite(self):
+        # The rewrite drops entries replay skipped; keep their bytes first
+        keep_damaged(self.path, self.damaged)
+        self.damaged = []
+        written = replace_file(
+            self.path, (pickle.dumps(record, protocol=2) for record in self.index.values()),
+            self.log.durability)
+        if metrics.ENABLED:
+            metrics.add(bytes_written=written)
+        self.dead = 0
+        self.entries = len(self.index)
+        self.offset = written
+        self.checksum = file_checksum(self.path, self.offset)
+        self.version = file_version(self.path)
+
+    def compact(self):
+        """Drop tombstones and superseded records from the journal."""
+        self.save()
+
+    def _append(self, *entries):
+        self.log.append(b"".join(pickle.dumps(entry, protocol=2) for entry in entries))
+
+    # ----- Lookup -----
+    def get(self, room_no):
+        """Return the record for a room, or None if it is free."""
+        return self.index.get(room_no)
+
+    def rooms(self):
+        """Return the set of occupied room numbers."""
+        return set(self.index)
+
+    def __contains__(self, room_no):
+        return room_no in self.index
+
+    def __iter__(self):
+        return iter(list(self.index.values()))
+
+    def __len__(self):
+        return len(self.index)
+
+    def scan(self, room_no=None, rooms=None, name_prefix=None):
+        """Yield matching records lazily; stop iterating to stop the scan.
+
+        room_no picks one room, rooms limits to a category's room range
+        and name_prefix matches the start of the name, case-insensitively.
+        """
+        if room_no is not None:
+            candidates = [room_no] if room_no in self.index else []
+        elif rooms is not None and len(rooms) < len(self.index):
+            candidates = (room for room in rooms if room in self.index)
+        else:
+            candidates = (room for room in list(self.index)
+                          if rooms is None or room in rooms)
+        for room in candidates:
+            record = self.index.get(room)
+            if record is not None and matches(record, name_prefix):
+                yield record
+
+    def page(self, offset, limit, sort="room", reverse=False):
+        """Return one page of records in a SORT_KEYS order."""
+        order = self.orders.get(sort)
+        if order is None:
+            key = SORT_KEYS[sort]
+            order = sorted(self.index, key=lambda room: key(self.index[room], room))
+            self.orders[sort] = order
+        return [self.index[room] for room in page_of(order, offset, limit, reverse)]
+
+    # ----- Changes -----
+    def insert(self, record):
+        """Add a booking and append it to hotel.dat."""
+        room = room_of(record)
+        if room in self.index:
+            raise ValueError(f"Room {room} is already occupied.")
+        self.index[room] = record
+        self.orders = {}
+        self._append(record)
+
+    def insert_many(self, records):
+        """Add a group of bookings with a single append to hotel.dat."""
+        records = list(records)
+        rooms = [room_of(record) for record in records]
+        counts = Counter(rooms)
+        taken = sorted(room for room in counts if room in self.index or counts[room] > 1)
+        if taken:
+            raise ValueError(f"Rooms already occupied: {taken}")
+        for room, record in zip(rooms, records):
+            self.index[room] = record
+        self.orders = {}
+        self._append(*records)
+
+    def delete(self, room_no):
+        """Remove the booking for a room and return it (None if not found)."""
+        removed = self.delete_many([room_no])
+        return removed[0] if removed else None
+
+    def delete_many(self, room_numbers):
+        """Remove several bookings with one write; returns the removed records."""
+        if not self.journal:
+            self.log.flush()
+            with file_lock(self.path):
+                # Catch up first, so the rewrite keeps other desks' bookings
+                self._catch_up(self.unreported)
+                removed = self._pop(room_numbers)
+                if removed:
+                    self._rewrite()
+            return removed
+
+        removed = self._pop(room_numbers)
+        if not removed:
+            return removed
+        self._append(*(Tombstone(room_of(record)) for record in removed))
+        self.dead += 2 * len(removed)
+        if self.dead > max(len(self.index), COMPACT_MIN):
+            self.compact()
+        return removed
+
+    def _pop(self, room_numbers):
+        removed = []
+        for room in room_numbers:
+            record = self.index.pop(room, None)
+            if record is not None:
+                removed.append(record)
+        if removed:
+            self.orders = {}
+        return removed
+
+
+@metrics.timed("load")
+def open_store(fmt=None):
+    """Open the booking store for the configured file format."""
+    fmt = fmt or STORE_FORMAT
+    if fmt == "pickle":
+        return BookingStore()
+    if fmt == "fixed":
+        from fixedstore import FixedRecordStore
+        return FixedRecordStore()
+    if fmt == "sqlite":
+        from sqlstore import SQLiteStore
+        return SQLiteStore()
+    if fmt == "service":
+        from service import RemoteStore
+        return RemoteStore()
+    raise ValueError(f"Unknown booking store format: {fmt!r}")
+
+
+# -----------------------------
+# Keeping Indexes Current
+# -----------------------------
+def store_changes(store):
+    """(added, removed) records other processes saved since the store was
+    last read; stores without refresh() only change through this one."""
+    refresh = getattr(store, "refresh", None)
+    return refresh() if refresh is not None else ([], [])
+
+
+def apply_changes(store, rooms, search, book, added, removed):
+    """Bring the allocator, search index and stays (None to skip one) in
+    line with a store's refresh() / resume() changes."""
+    for record in removed:
+        if search is not None:
+            search.remove(record)
+        if book is not None:
+            book.end_stay(record)
+    for record in added:
+        if search is not None:
+            search.add(record)
+        if book is not None:
+            book.start_stay(record)
+    if rooms is not None:
+        for room in {room_of(record) for record in removed + added}:
+            if room in store:
+                rooms.take(room)
+            else:
+                rooms.release(room)
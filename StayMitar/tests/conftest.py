@@ -0,0 +1,8 @@
+"""Make the StayMitar scripts importable and read the repo's inventory."""
+
+import os
+import sys
+
+HERE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, HERE)
+os.environ.setdefault("STAYMITAR_INVENTORY", os.path.join(HERE, "inventory.json"))
@@ -0,0 +1,24 @@
+"""Analytics aggregates over bookings with and without known stay lengths."""
+
+from datetime import date
+
+import pytest
+
+from booking import CARD, CASH, Booking
+
+np = pytest.importorskip("numpy")
+from analytics import load_columns, summarize  # noqa: E402
+
+
+def test_category_average_stay_ignores_unknown_lengths():
+    bookings = [
+        Booking("Asha", "Pune", "9876543210", 1, 6000.0, 3,
+                date(2026, 1, 1), date(2026, 1, 4), payment=CARD),
+        Booking("Ravi", "Goa", "9123456780", 2, 2000.0, payment=CASH),
+    ]
+
+    summary = summarize(load_columns(bookings))
+
+    deluxe = summary["categories"]["Deluxe"]
+    assert deluxe["stays"] == 2
+    assert deluxe["average_stay_days"] == summary["average_stay_days"] == 3.0
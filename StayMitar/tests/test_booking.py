@@ -0,0 +1,73 @@
+"""Loading bookings pickled by the old front ends."""
+
+import os
+import pickle
+import shutil
+import sys
+
+import pytest
+
+from booking import Booking
+from storage import BookingStore, Record, iter_records, mobile_of, room_of
+
+HERE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class _Old:
+    """Stand-in for an old front end's booking class."""
+
+    def __init__(self, **fields):
+        self.__dict__.update(fields)
+
+
+def legacy_pickle(cls, fields):
+    """A protocol 2 pickle of __main__.<cls>, as the old scripts wrote them."""
+    data = pickle.dumps(_Old(**fields), protocol=2)
+    return data.replace(f"c{_Old.__module__}\n_Old\n".encode(), f"c__main__\n{cls}\n".encode())
+
+
+OLD_GUI = dict(name="Asha", address="Pune", mobile="9876543210", room_no=101, price=2500.0)
+OLD_CONSOLE = dict(name="Ravi", address="Goa", mobile_no="9123456780", days=2, room=7, price=3000)
+
+
+@pytest.fixture
+def main_has_booking(monkeypatch):
+    # main.py and the check-in window import the slotted Booking into __main__
+    monkeypatch.setattr(sys.modules["__main__"], "Booking", Booking, raising=False)
+
+
+def test_old_gui_booking_loads_through_the_store(tmp_path, main_has_booking):
+    path = str(tmp_path / "hotel.dat")
+    with open(path, "wb") as f:
+        f.write(legacy_pickle("Booking", OLD_GUI))
+
+    (record,) = iter_records(path)
+    assert isinstance(record, Record)
+    assert (room_of(record), mobile_of(record), record.name) == (101, "9876543210", "Asha")
+    assert BookingStore(path).rooms() == {101}
+
+
+def test_old_gui_booking_unpickles_as_booking(main_has_booking):
+    record = pickle.loads(legacy_pickle("Booking", OLD_GUI))
+
+    assert isinstance(record, Booking)
+    assert (record.room_no, record.mobile_no, record.price) == (101, "9876543210", 2500.0)
+    assert record.payment is None and record.arrival is None
+
+
+def test_old_console_guest_maps_room_onto_room_no():
+    record = Booking.__new__(Booking)
+    record.__setstate__(dict(OLD_CONSOLE))
+
+    assert (record.room_no, record.mobile_no, record.days) == (7, "9123456780", 2)
+
+
+def test_main_save_records_in_the_shipped_hotel_dat_load(tmp_path):
+    # The repo's hotel.dat holds __main__.save pickles from the first console
+    path = str(tmp_path / "hotel.dat")
+    shutil.copy(os.path.join(HERE, "hotel.dat"), path)
+
+    store = BookingStore(path)
+    assert store.rooms() == {6, 8, 9, 26}
+    assert store.get(8).name == "ajay"
+    assert mobile_of(store.get(8)) == "1231231231"
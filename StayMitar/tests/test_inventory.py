@@ -0,0 +1,25 @@
+"""Inventory validation of categories and floors."""
+
+import pytest
+
+from inventory import Inventory
+
+CATEGORIES = {"1": {"name": "Deluxe", "rate": 2000, "rooms": [[1, 20]]}}
+
+
+def test_floors_are_looked_up_by_room():
+    inventory = Inventory({"categories": CATEGORIES, "floors": [
+        {"floor": 2, "rooms": [11, 20], "surcharge": 100},
+        {"floor": 1, "rooms": [1, 10]},
+    ]})
+
+    assert inventory.floor_of(5)["floor"] == 1
+    assert inventory.rate_of(15) == 2100
+
+
+@pytest.mark.parametrize("second", [[1, 10], [5, 15]])
+def test_overlapping_floors_are_rejected(second):
+    floors = [{"floor": 1, "rooms": [1, 10]}, {"floor": 2, "rooms": second}]
+
+    with pytest.raises(ValueError, match="more than one floor"):
+        Inventory({"categories": CATEGORIES, "floors": floors})
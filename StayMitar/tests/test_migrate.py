@@ -0,0 +1,23 @@
+"""migrate.py carries every Booking field over."""
+
+import pickle
+from datetime import date
+
+from booking import CARD, Booking
+from migrate import migrate
+from storage import iter_records
+
+
+def test_migrate_keeps_payment_and_dates(tmp_path):
+    src, dst = str(tmp_path / "hotel.dat"), str(tmp_path / "clean.dat")
+    with open(src, "wb") as f:
+        f.write(pickle.dumps(Booking("Asha", "Pune", "9876543210", 101, 2500.0, 2,
+                                     date(2026, 1, 1), date(2026, 1, 3), payment=CARD), 2))
+        f.write(pickle.dumps(Booking("Ravi", "Goa", "9123456780", 102, 1000.0), 2))
+
+    stats = migrate(src, dst)
+
+    card, unknown = iter_records(dst)
+    assert stats["records"] == 2
+    assert (card.payment, card.arrival, card.departure) == (CARD, date(2026, 1, 1), date(2026, 1, 3))
+    assert unknown.payment is None
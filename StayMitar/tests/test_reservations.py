@@ -0,0 +1,39 @@
+"""ReservationBook loading and lookups."""
+
+import pickle
+from datetime import date
+
+from reservations import Reservation, ReservationBook
+
+
+def reservation(name, room, arrival, departure):
+    return Reservation(name, "Pune", "9876543210", room, arrival, departure, 1000.0)
+
+
+def test_overlapping_reservations_are_skipped_not_fatal(tmp_path, capsys):
+    path = str(tmp_path / "reservations.dat")
+    # Two desks reserved room 5 for overlapping dates on their own
+    with open(path, "wb") as f:
+        f.write(pickle.dumps(reservation("Asha", 5, date(2026, 3, 1), date(2026, 3, 4)), 2))
+        f.write(pickle.dumps(reservation("Ravi", 5, date(2026, 3, 2), date(2026, 3, 5)), 2))
+
+    book = ReservationBook(path=path)
+
+    assert [r.name for r in book.upcoming()] == ["Asha"]
+    assert [r.name for r in book.clashing] == ["Ravi"]
+    assert "Ravi" in capsys.readouterr().err
+    # Saving keeps the clashing entry for someone to sort out
+    book.cancel(5, date(2026, 3, 1))
+    assert [r.name for r in ReservationBook(path=path).upcoming()] == ["Ravi"]
+
+
+def test_arriving_finds_the_reservation_covering_the_day(tmp_path):
+    book = ReservationBook(path=str(tmp_path / "reservations.dat"))
+    book.reserve(reservation("Asha", 5, date(2026, 3, 1), date(2026, 3, 4)))
+    book.reserve(reservation("Ravi", 5, date(2026, 3, 4), date(2026, 3, 6)))
+
+    assert book.arriving(5, date(2026, 2, 28)) is None
+    assert book.arriving(5, date(2026, 3, 3)).name == "Asha"
+    assert book.arriving(5, date(2026, 3, 4)).name == "Ravi"
+    assert book.arriving(5, date(2026, 3, 6)) is None
+    assert book.arriving(6, date(2026, 3, 3)) is None
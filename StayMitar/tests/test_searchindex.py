@@ -0,0 +1,24 @@
+"""GuestIndex built from a store and kept current."""
+
+from booking import Booking
+from searchindex import GuestIndex
+from storage import BookingStore
+
+
+def test_index_built_from_a_store_matches_one_built_by_add(tmp_path):
+    guests = [Booking(name, "Pune", f"98765432{room:02}", room, 1000.0)
+              for room, name in [(7, "ravi"), (3, "Asha"), (5, "Ravi"), (9, "Mina")]]
+    store = BookingStore(str(tmp_path / "hotel.dat"))
+    store.insert_many(guests)
+    built = GuestIndex(store)
+    added = GuestIndex()
+    for guest in guests:
+        added.add(guest)
+
+    assert built.names == added.names
+    assert built.mobiles == added.mobiles
+    assert built.by_name("ra") == [5, 7]
+
+    built.remove(guests[0])
+    built.add(Booking("Raj", "Goa", "9000000000", 8, 500.0))
+    assert built.by_name("RA") == [8, 5]
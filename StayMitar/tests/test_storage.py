@@ -0,0 +1,101 @@
+"""BookingStore journal replay and rewrites with several desks on one file."""
+
+import pytest
+
+from booking import Booking
+from storage import BookingStore
+
+
+def guest(room, name="Guest"):
+    return Booking(name, "Pune", "9876543210", room, 1000.0)
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "hotel.dat")
+
+
+def open_desk(path, journal=True):
+    return BookingStore(path, journal=journal, durability="each")
+
+
+def test_journal_replay(path):
+    desk = open_desk(path)
+    desk.insert_many([guest(1), guest(2), guest(3)])
+    desk.delete(2)
+    desk.insert(guest(2, "Other"))
+    desk.delete(3)
+
+    reopened = open_desk(path)
+    assert sorted(reopened.rooms()) == [1, 2]
+    assert reopened.get(2).name == "Other"
+
+
+def test_refresh_replays_another_desks_appends(path):
+    desk_a, desk_b = open_desk(path), open_desk(path)
+    desk_b.insert(guest(5))
+    desk_b.delete(5)
+    desk_b.insert(guest(6))
+
+    added, removed = desk_a.refresh()
+    assert [room for room in desk_a.rooms()] == [6]
+    assert [record.room_no for record in added] == [6]
+    assert removed == []
+
+
+def test_compaction_keeps_another_desks_bookings(path):
+    desk_a = open_desk(path)
+    desk_a.insert_many([guest(room) for room in range(1, 61)])
+    desk_b = open_desk(path)
+    desk_b.insert(guest(500))
+
+    # Enough checkouts for the journal to compact itself
+    desk_a.delete_many(range(1, 60))
+
+    assert sorted(open_desk(path).rooms()) == [60, 500]
+    assert sorted(desk_a.rooms()) == [60, 500]
+
+
+def test_rewrite_mode_checkout_keeps_another_desks_bookings(path):
+    desk_a = open_desk(path, journal=False)
+    desk_a.insert_many([guest(1), guest(2)])
+    desk_b = open_desk(path, journal=False)
+    desk_b.insert(guest(3))
+
+    desk_a.delete(1)
+
+    assert sorted(open_desk(path).rooms()) == [2, 3]
+
+
+def test_refresh_reports_what_a_rewrite_caught_up_on(path):
+    desk_a = open_desk(path)
+    desk_a.insert_many([guest(1), guest(2)])
+    desk_b = open_desk(path)
+    desk_b.insert(guest(3))
+
+    desk_a.save()
+
+    added, removed = desk_a.refresh()
+    assert [record.room_no for record in added] == [3]
+    assert removed == []
+
+
+def test_refresh_reloads_a_rewrite_that_reused_the_inode(path, tmp_path):
+    desk_a = open_desk(path)
+    desk_a.insert_many([guest(1), guest(2)])
+    desk_a.refresh()
+    # Another desk's rewrite, landing on hotel.dat's old inode (as ext4
+    # hands out freed inode numbers again)
+    other = open_desk(str(tmp_path / "other.dat"))
+    other.insert_many([guest(10), guest(11), guest(12)])
+    with open(other.path, "rb") as f:
+        data = f.read()
+    with open(path, "r+b") as f:
+        f.write(data)
+        f.truncate()
+
+    added, removed = desk_a.refresh()
+    assert sorted(desk_a.rooms()) == [10, 11, 12]
+    assert sorted(record.room_no for record in removed) == [1, 2]
+    assert sorted(record.room_no for record in added) == [10, 11, 12]
+    assert desk_a.damaged == []
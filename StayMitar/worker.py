@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Hotel Management - Background Storage Worker
+Runs store operations off the Tk event loop
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from tkinter import TclError
+
+# One thread for the whole process, so store calls never run concurrently;
+# the shared allocator, search index and stays are only changed on it too
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="storage")
+
+
+# -----------------------------
+# Background Worker
+# -----------------------------
+class BackgroundWorker:
+    """Submits storage calls to the worker thread and hands results back
+    to a window through `after` callbacks, showing a busy cursor meanwhile."""
+
+    POLL_MS = 20
+
+    def __init__(self, widget):
+        self.widget = widget
+        self.pending = 0
+
+    def submit(self, fn, *args, on_done=None, on_error=None):
+        """Run fn(*args) in the background; call on_done(result) or
+        on_error(exc) on the Tk thread when it finishes."""
+        future = _executor.submit(fn, *args)
+        self._set_busy(1)
+        self._schedule(future, on_done, on_error)
+        return future
+
+    @property
+    def busy(self):
+        return self.pending > 0
+
+    def _schedule(self, future, on_done, on_error):
+        try:
+            self.widget.after(self.POLL_MS, self._poll, future, on_done, on_error)
+        except TclError:
+            pass  # window closed while the call was running
+
+    def _poll(self, future, on_done, on_error):
+        if not future.done():
+            self._schedule(future, on_done, on_error)
+            return
+
+        self._set_busy(-1)
+        error = future.exception()
+        if error is not None:
+            if on_error is None:
+                raise error
+            on_error(error)
+        elif on_done is not None:
+            on_done(future.result())
+
+    def _set_busy(self, delta):
+        self.pending += delta
+        try:
+            self.widget.configure(cursor="watch" if self.pending else "")
+        except TclError:
+            pass